@@ -1,11 +1,23 @@
 from dataclasses import dataclass
 from typing import List, Optional
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from itertools import chain, islice
+from math import factorial
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict, deque
+import argparse
+import ast
+import csv
 import heapq
-import tkinter as tk
-from tkinter import ttk
-from tkinter import messagebox
+import json
+import mmap
+import os
+import signal
+import sqlite3
+import sys
 import time
+import tracemalloc
 
 # --------- Node Class -----------
 @dataclass
@@ -24,7 +36,7 @@ class Node:
 class State:
     def __init__(self, state: List[List[int]]):
         self.state = state
-        self.size = 3  # For 8-puzzle
+        self.size = len(state)
 
     def find_zero(self):
         for i in range(self.size):
@@ -58,8 +70,172 @@ class State:
         return result
 
 
+# --------- Packed State Encoding -----------
+# Boards are packed into a single int in row-major order, 4 bits per cell up
+# to 4x4 (64 bits for the 15-puzzle) and 5 bits for 5x5, so hashing/comparing
+# a state is an int operation instead of str(list).
+DIRECTIONS = ['up', 'down', 'left', 'right']
+MOVE_LETTERS = {'up': 'U', 'down': 'D', 'left': 'L', 'right': 'R'}
+LETTER_MOVES = {letter: move for move, letter in MOVE_LETTERS.items()}
+
+
+class BoardCodec:
+    def __init__(self, size: int = 3):
+        self.size = size
+        self.cells = size * size
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        # move_table[blank] -> ((action, new_blank), ...) in DIRECTIONS order
+        self.move_table = []
+        for blank in range(self.cells):
+            i, j = divmod(blank, size)
+            moves = []
+            if i > 0:
+                moves.append(('up', blank - size))
+            if i < size - 1:
+                moves.append(('down', blank + size))
+            if j > 0:
+                moves.append(('left', blank - 1))
+            if j < size - 1:
+                moves.append(('right', blank + 1))
+            self.move_table.append(tuple(moves))
+
+    def pack(self, state: List[List[int]]) -> int:
+        packed = 0
+        for idx, val in enumerate(v for row in state for v in row):
+            packed |= val << (idx * self.bits)
+        return packed
+
+    def unpack(self, packed: int) -> List[List[int]]:
+        flat = [(packed >> (idx * self.bits)) & self.mask for idx in range(self.cells)]
+        return [flat[i:i + self.size] for i in range(0, self.cells, self.size)]
+
+    def tiles(self, packed: int) -> List[int]:
+        return [(packed >> (idx * self.bits)) & self.mask for idx in range(self.cells)]
+
+    def find_blank(self, packed: int) -> int:
+        for idx in range(self.cells):
+            if (packed >> (idx * self.bits)) & self.mask == 0:
+                return idx
+        raise ValueError("Board has no blank tile")
+
+    def parity(self, packed: int) -> int:
+        """Move-invariant parity: tile inversions, plus the blank's row on even widths."""
+        tiles = [tile for tile in self.tiles(packed) if tile]
+        inversions = 0
+        for i in range(len(tiles)):
+            for j in range(i + 1, len(tiles)):
+                if tiles[i] > tiles[j]:
+                    inversions += 1
+        if self.size % 2 == 0:
+            inversions += self.find_blank(packed) // self.size
+        return inversions % 2
+
+    def is_solvable(self, start: int, goal: int) -> bool:
+        return self.parity(start) == self.parity(goal)
+
+    def successors(self, packed: int, blank: int):
+        # Blank cell holds 0, so XOR-ing the tile into both cells swaps them.
+        result = []
+        blank_shift = blank * self.bits
+        for action, target in self.move_table[blank]:
+            shift = target * self.bits
+            tile = (packed >> shift) & self.mask
+            result.append((action, packed ^ (tile << shift) ^ (tile << blank_shift), target))
+        return result
+
+    def replay(self, init_state: List[List[int]], actions) -> Node:
+        """Build the Node chain for `actions` (direction names or U/D/L/R letters) from init_state."""
+        node = Node(init_state, None, None, 0, 0)
+        packed = self.pack(init_state)
+        blank = self.find_blank(packed)
+        for action in actions:
+            action = LETTER_MOVES.get(action, action)
+            for move, target in self.move_table[blank]:
+                if move == action:
+                    break
+            else:
+                raise ValueError(f"Illegal move {action!r}")
+            tile = (packed >> (target * self.bits)) & self.mask
+            packed ^= (tile << (target * self.bits)) ^ (tile << (blank * self.bits))
+            blank = target
+            node = Node(self.unpack(packed), node, action, 0, node.depth + 1)
+        return node
+
+    def build_path(self, parents, packed: int) -> Node:
+        """Rebuild the Node chain (list states) from a {child: (parent, action)} map."""
+        chain = []
+        while packed is not None:
+            parent, action = parents[packed]
+            chain.append((packed, action))
+            packed = parent
+        node = None
+        for depth, (packed, action) in enumerate(reversed(chain)):
+            node = Node(self.unpack(packed), node, action, 0, depth)
+        return node
+
+
+_CODECS = {}
+
+
+def get_codec(size: int) -> BoardCodec:
+    if size not in _CODECS:
+        _CODECS[size] = BoardCodec(size)
+    return _CODECS[size]
+
+
+def codec_for(state: List[List[int]]) -> BoardCodec:
+    return get_codec(len(state))
+
+
 # --------- Abstract Search Base Class -----------
 class SearchingStrategy(ABC):
+    # Whether returned paths are guaranteed shortest (lets caches reuse suffixes).
+    optimal = False
+    # When True, searches wrap successor generation, heuristic evaluation and
+    # frontier operations with timers (adds overhead; off by default).
+    phase_timing = False
+    # False for searches whose answer depends on wall-clock time.
+    cacheable = True
+
+    def __init__(self):
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"expanded": 0, "generated": 0, "reopened": 0, "frontier_peak": 0, "visited_peak": 0}
+        self.phase_times = {}
+
+    def timed(self, phase: str, fn):
+        """Return `fn`, or a wrapper adding its run time to phase_times[phase] when phase_timing is on."""
+        if not self.phase_timing:
+            return fn
+        times = self.phase_times
+        times.setdefault(phase, 0.0)
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                times[phase] += clock() - start
+        return wrapper
+
+    def measure(self, init_state, goal_state, trace_memory: bool = False) -> Optional[Node]:
+        """Run search() and add wall time (and the tracemalloc peak, if asked) to stats."""
+        if trace_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            node = self.search(init_state, goal_state)
+        finally:
+            self.stats["time"] = time.perf_counter() - start
+            if trace_memory:
+                self.stats["memory_peak"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        return node
+
     @abstractmethod
     def search(self, init_state: List[List[int]], goal_state: List[List[int]]) -> Optional[Node]:
         pass
@@ -67,171 +243,1053 @@ class SearchingStrategy(ABC):
 
 # --------- Breadth-First Search -----------
 class BFSearch(SearchingStrategy):
+    optimal = True
+
     def search(self, init_state, goal_state):
-        root = Node(init_state, None, None, 0, 0)
-        queue = [root]
-        visited = set()
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        successors = self.timed("successors", codec.successors)
+        start = codec.pack(init_state)
+        goal = codec.pack(goal_state)
+        parents = {start: (None, None)}
+        queue = deque([(start, codec.find_blank(start))])
 
         while queue:
-            node = queue.pop(0)
-            if node.state == goal_state:
-                return node
-            visited.add(str(node.state))
+            if len(queue) > stats["frontier_peak"]:
+                stats["frontier_peak"] = len(queue)
+            packed, blank = queue.popleft()
+            if packed == goal:
+                stats["visited_peak"] = len(parents)
+                return codec.build_path(parents, packed)
+            stats["expanded"] += 1
 
-            for action, new_state in State(node.state).successors():
-                if str(new_state) not in visited:
-                    child = Node(new_state, node, action, 0, node.depth + 1)
-                    queue.append(child)
+            for action, child, child_blank in successors(packed, blank):
+                if child not in parents:
+                    parents[child] = (packed, action)
+                    queue.append((child, child_blank))
+                    stats["generated"] += 1
+        stats["visited_peak"] = len(parents)
         return None
 
 #-----------DFS------------------------
 class DFSearch(SearchingStrategy):
     def search(self, init_state, goal_state):
-        root = Node(init_state, None, None, 0, 0)
-        stack = [root]
-        visited = set()
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        successors = self.timed("successors", codec.successors)
+        start = codec.pack(init_state)
+        goal = codec.pack(goal_state)
+        parents = {}
+        stack = [(start, codec.find_blank(start), None, None)]
 
         while stack:
-            node = stack.pop()
-            if node.state == goal_state:
-                return node
-            visited.add(str(node.state))
+            if len(stack) > stats["frontier_peak"]:
+                stats["frontier_peak"] = len(stack)
+            packed, blank, parent, action = stack.pop()
+            if packed in parents:
+                continue
+            parents[packed] = (parent, action)
+            if packed == goal:
+                stats["visited_peak"] = len(parents)
+                return codec.build_path(parents, packed)
+            stats["expanded"] += 1
 
-            for action, new_state in reversed(State(node.state).successors()):
-                if str(new_state) not in visited:
-                    child = Node(new_state, node, action, 0, node.depth + 1)
-                    stack.append(child)
+            for child_action, child, child_blank in reversed(successors(packed, blank)):
+                if child not in parents:
+                    stack.append((child, child_blank, packed, child_action))
+                    stats["generated"] += 1
+        stats["visited_peak"] = len(parents)
         return None
 
 #---------Iterative Deepening DFS------------
 class IDDFSearch(SearchingStrategy):
     def search(self, init_state, goal_state):
-        def dls(node, depth_limit):
-            if node.state == goal_state:
-                return node
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        successors = self.timed("successors", codec.successors)
+        goal = codec.pack(goal_state)
+        path = []  # actions from the root to the current node
+
+        def dls(packed, blank, depth_limit):
+            if packed == goal:
+                return True
             if depth_limit == 0:
-                return None
-            for action, new_state in State(node.state).successors():
-                child = Node(new_state, node, action, 0, node.depth + 1)
-                result = dls(child, depth_limit - 1)
-                if result:
-                    return result
-            return None
+                return False
+            stats["expanded"] += 1
+            for action, child, child_blank in successors(packed, blank):
+                stats["generated"] += 1
+                path.append((action, child))
+                if len(path) > stats["frontier_peak"]:
+                    stats["frontier_peak"] = len(path)
+                if dls(child, child_blank, depth_limit - 1):
+                    return True
+                path.pop()
+            return False
 
+        start = codec.pack(init_state)
         for depth in range(50):  # Max depth limit
-            root = Node(init_state, None, None, 0, 0)
-            result = dls(root, depth)
-            if result:
-                return result
+            if dls(start, codec.find_blank(start), depth):
+                node = Node(init_state, None, None, 0, 0)
+                for action, packed in path:
+                    node = Node(codec.unpack(packed), node, action, 0, node.depth + 1)
+                return node
+        return None
+
+
+# --------- Bidirectional BFS -----------
+OPPOSITE = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+
+class BidirectionalBFSearch(SearchingStrategy):
+    """Layer-by-layer BFS from both ends, always growing the smaller frontier.
+
+    When a layer touches the other side, the whole layer is finished and the
+    cheapest meeting point kept, so the joined path is still optimal.
+    """
+    optimal = True
+
+    def search(self, init_state, goal_state):
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        successors = self.timed("successors", codec.successors)
+        start = codec.pack(init_state)
+        goal = codec.pack(goal_state)
+        if start == goal:
+            return codec.build_path({start: (None, None)}, start)
+
+        # forward[s] = (parent, action from parent); backward[s] = (next state toward goal, action to it)
+        forward = {start: (None, None)}
+        backward = {goal: (None, None)}
+        forward_layer = [(start, codec.find_blank(start))]
+        backward_layer = [(goal, codec.find_blank(goal))]
+
+        while forward_layer and backward_layer:
+            frontier = len(forward_layer) + len(backward_layer)
+            if frontier > stats["frontier_peak"]:
+                stats["frontier_peak"] = frontier
+            is_forward = len(forward_layer) <= len(backward_layer)
+            layer, seen, other = (forward_layer, forward, backward) if is_forward else (backward_layer, backward, forward)
+
+            next_layer = []
+            best = None  # (length through the meeting state, meeting state)
+            for packed, blank in layer:
+                stats["expanded"] += 1
+                for action, child, child_blank in successors(packed, blank):
+                    if child in seen:
+                        continue
+                    seen[child] = (packed, action) if is_forward else (packed, OPPOSITE[action])
+                    next_layer.append((child, child_blank))
+                    stats["generated"] += 1
+                    if child in other:
+                        length = self.chain_length(forward, child) + self.chain_length(backward, child)
+                        if best is None or length < best[0]:
+                            best = (length, child)
+
+            if best is not None:
+                stats["visited_peak"] = len(forward) + len(backward)
+                return self.join(codec, forward, backward, best[1])
+            if is_forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        stats["visited_peak"] = len(forward) + len(backward)
         return None
 
+    def chain_length(self, links, packed):
+        length = 0
+        while links[packed][0] is not None:
+            packed = links[packed][0]
+            length += 1
+        return length
+
+    def join(self, codec, forward, backward, meet):
+        parents = {}
+        packed = meet
+        while packed is not None:
+            parents[packed] = forward[packed]
+            packed = forward[packed][0]
+        packed = meet
+        while backward[packed][0] is not None:
+            after, action = backward[packed]
+            parents[after] = (packed, action)
+            packed = after
+        return codec.build_path(parents, packed)
+
+
+# --------- Additive Pattern Database -----------
+# Disjoint tile groups are solved exactly (counting only moves of the group's
+# own tiles) by a retrograde 0-1 BFS from the goal.  Their sums stay
+# admissible.  Tables hold one byte per placement of the group, indexed by
+# its positions in base `cells`, and are read back through mmap.
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_db")
+# 4-4 for the 8-puzzle, 5-5-5 for the 15-puzzle; larger boards fall back to
+# consecutive groups of four tiles.
+DEFAULT_PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+}
+_PDB_CACHE = {}
+
+
+def default_partition(size: int):
+    if size in DEFAULT_PARTITIONS:
+        return DEFAULT_PARTITIONS[size]
+    tiles = list(range(1, size * size))
+    return tuple(tuple(tiles[i:i + 4]) for i in range(0, len(tiles), 4))
+
+
+class PatternDatabase:
+    def __init__(self, goal_state: List[List[int]], partition=None, path: Optional[str] = None):
+        self.codec = codec_for(goal_state)
+        self.goal = self.codec.pack(goal_state)
+        self.partition = tuple(tuple(group) for group in partition or default_partition(self.codec.size))
+        self.path = path or os.path.join(PDB_DIR, self.file_name())
+        self.layout = []  # (tiles, offset into the table)
+        offset = 0
+        for group in self.partition:
+            self.layout.append((group, offset))
+            offset += self.codec.cells ** len(group)
+        self.table_size = offset
+        self.table = None
+
+    @classmethod
+    def for_goal(cls, goal_state, partition=None):
+        partition = partition or default_partition(len(goal_state))
+        key = (len(goal_state), codec_for(goal_state).pack(goal_state), tuple(tuple(group) for group in partition))
+        if key not in _PDB_CACHE:
+            _PDB_CACHE[key] = cls(goal_state, partition).load()
+        return _PDB_CACHE[key]
+
+    def file_name(self):
+        groups = "-".join("_".join(str(t) for t in group) for group in self.partition)
+        return f"pdb{self.codec.size}_{self.goal:x}_{groups}.bin"
+
+    def build_group(self, group) -> bytearray:
+        # Search states are (placement index, blank cell) flattened into one
+        # int, with distances kept in a flat bytearray instead of a dict.
+        cells = self.codec.cells
+        move_table = self.codec.move_table
+        weights = [cells ** (len(group) - 1 - k) for k in range(len(group))]
+        goal_tiles = self.codec.tiles(self.goal)
+        start = sum(goal_tiles.index(tile) * w for tile, w in zip(group, weights))
+        start = start * cells + goal_tiles.index(0)
+
+        table = bytearray(b"\xff") * (cells ** len(group))
+        dist = bytearray(b"\xff") * (cells ** (len(group) + 1))
+        done = bytearray(len(dist))
+        dist[start] = 0
+        queue = deque([start])
+
+        while queue:
+            key = queue.popleft()
+            if done[key]:
+                continue
+            done[key] = 1
+            cost = dist[key]
+            index, blank = divmod(key, cells)
+            if cost < table[index]:
+                table[index] = cost
+            occupant = {}  # cell -> index weight of the group tile on it
+            rest = index
+            for w in weights:
+                pos, rest = divmod(rest, w)
+                occupant[pos] = w
+            for _, target in move_table[blank]:
+                w = occupant.get(target)
+                if w is None:
+                    # Only the blank moves: free.
+                    child = index * cells + target
+                    if cost < dist[child]:
+                        dist[child] = cost
+                        queue.appendleft(child)
+                else:
+                    # A group tile slides into the blank: costs one move.
+                    child = (index + (blank - target) * w) * cells + target
+                    if cost + 1 < dist[child]:
+                        dist[child] = cost + 1
+                        queue.append(child)
+        return table
+
+    def build(self) -> 'PatternDatabase':
+        data = bytearray()
+        for group in self.partition:
+            data += self.build_group(group)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Per-process temp name: workers that build the same table at once each replace it whole.
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        return self
+
+    def load(self) -> 'PatternDatabase':
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != self.table_size:
+            self.build()
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != self.table_size:
+                raise ValueError(f"{self.path} is not a {self.table_size}-byte pattern database")
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def group_index(self, packed: int, group) -> int:
+        cells, bits, mask = self.codec.cells, self.codec.bits, self.codec.mask
+        pos = [0] * cells
+        for idx in range(cells):
+            pos[(packed >> (idx * bits)) & mask] = idx
+        index = 0
+        for tile in group:
+            index = index * cells + pos[tile]
+        return index
+
+    def value(self, packed: int) -> int:
+        return sum(self.table[offset + self.group_index(packed, group)] for group, offset in self.layout)
+
+
+# --------- Perfect Distance Table -----------
+# Exact distance to the goal for every reachable board (9!/2 for the
+# 8-puzzle), one byte each.  A board is ranked as blank cell * (n-1)!/2 plus
+# half the Lehmer rank of its tiles read without the blank: ranks 2k and 2k+1
+# differ by one tile swap, and only one of them is reachable.
+class DistanceTable:
+    def __init__(self, goal_state: List[List[int]], path: Optional[str] = None):
+        self.codec = codec_for(goal_state)
+        if self.codec.cells > 9:
+            raise ValueError("A full distance table is only practical up to 3x3 boards")
+        self.goal = self.codec.pack(goal_state)
+        self.path = path or os.path.join(PDB_DIR, f"distance{self.codec.size}_{self.goal:x}.bin")
+        self.block = factorial(self.codec.cells - 1) // 2
+        self.table_size = self.codec.cells * self.block
+        self.table = None
+
+    @classmethod
+    def for_goal(cls, goal_state):
+        key = ("distance", len(goal_state), codec_for(goal_state).pack(goal_state))
+        if key not in _PDB_CACHE:
+            _PDB_CACHE[key] = cls(goal_state).load()
+        return _PDB_CACHE[key]
+
+    def index(self, packed: int) -> int:
+        tiles = []
+        blank = 0
+        bits, mask = self.codec.bits, self.codec.mask
+        for idx in range(self.codec.cells):
+            tile = (packed >> (idx * bits)) & mask
+            if tile:
+                tiles.append(tile)
+            else:
+                blank = idx
+        n = len(tiles)
+        rank = 0
+        for i in range(n):
+            smaller = 0
+            for j in range(i + 1, n):
+                if tiles[j] < tiles[i]:
+                    smaller += 1
+            rank = rank * (n - i) + smaller
+        return blank * self.block + (rank >> 1)
+
+    def build(self) -> 'DistanceTable':
+        dist = {self.goal: 0}
+        layer = [(self.goal, self.codec.find_blank(self.goal))]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for packed, blank in layer:
+                for _, child, child_blank in self.codec.successors(packed, blank):
+                    if child not in dist:
+                        dist[child] = depth
+                        next_layer.append((child, child_blank))
+            layer = next_layer
+
+        table = bytearray(b"\xff") * self.table_size
+        for packed, d in dist.items():
+            table[self.index(packed)] = d
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"  # see PatternDatabase.build
+        with open(tmp_path, "wb") as f:
+            f.write(table)
+        os.replace(tmp_path, self.path)
+        return self
+
+    def load(self) -> 'DistanceTable':
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != self.table_size:
+            self.build()
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != self.table_size:
+                raise ValueError(f"{self.path} is not a {self.table_size}-byte distance table")
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def distance(self, packed: int) -> Optional[int]:
+        if not self.codec.is_solvable(packed, self.goal):
+            return None
+        return self.table[self.index(packed)]
+
+
+class DistanceTableSearch(SearchingStrategy):
+    """Optimal paths by greedy descent on the perfect distance table (O(depth) lookups); 3x3 boards only."""
+    optimal = True
+
+    def search(self, init_state, goal_state):
+        self.reset_stats()
+        codec = codec_for(init_state)
+        if codec.cells > 9:
+            raise ValueError(f"The table strategy only solves 3x3 boards, not {codec.size}x{codec.size}")
+        table = DistanceTable.for_goal(goal_state)
+        packed = codec.pack(init_state)
+        d = table.distance(packed)
+        if d is None:
+            return None
+        parents = {packed: (None, None)}
+        blank = codec.find_blank(packed)
+        while d > 0:
+            self.stats["expanded"] += 1
+            for action, child, child_blank in codec.successors(packed, blank):
+                self.stats["generated"] += 1
+                if table.table[table.index(child)] == d - 1:
+                    break
+            parents[child] = (packed, action)
+            packed, blank, d = child, child_blank, d - 1
+        return codec.build_path(parents, packed)
+
+
+# --------- Incremental Heuristics -----------
+# A move slides one tile from `src` to `dst` (the parent's blank), so each
+# heuristic derives the child's value from the parent's instead of
+# rescanning the board.
+class Heuristic(ABC):
+    def __init__(self, goal_state: List[List[int]]):
+        self.codec = codec = codec_for(goal_state)
+        self.goal = codec.pack(goal_state)
+        size, cells = codec.size, codec.cells
+        self.goal_index = [0] * cells
+        for idx, tile in enumerate(codec.tiles(self.goal)):
+            self.goal_index[tile] = idx
+        # distance[tile][pos]: Manhattan distance of `tile` at `pos` from its goal cell
+        self.distance = [[0] * cells for _ in range(cells)]
+        for tile in range(1, cells):
+            gi, gj = divmod(self.goal_index[tile], size)
+            for pos in range(cells):
+                i, j = divmod(pos, size)
+                self.distance[tile][pos] = abs(gi - i) + abs(gj - j)
+
+    def manhattan(self, packed: int) -> int:
+        total = 0
+        bits, mask = self.codec.bits, self.codec.mask
+        for idx in range(self.codec.cells):
+            total += self.distance[(packed >> (idx * bits)) & mask][idx]
+        return total
+
+    @abstractmethod
+    def initial(self, packed: int) -> int:
+        pass
+
+    @abstractmethod
+    def update(self, value: int, parent: int, child: int, tile: int, src: int, dst: int) -> int:
+        pass
+
+
+class ManhattanHeuristic(Heuristic):
+    def initial(self, packed):
+        return self.manhattan(packed)
+
+    def update(self, value, parent, child, tile, src, dst):
+        return value - self.distance[tile][src] + self.distance[tile][dst]
+
+
+class LinearConflictHeuristic(Heuristic):
+    def __init__(self, goal_state):
+        super().__init__(goal_state)
+        size = self.codec.size
+        self.rows = [[i * size + j for j in range(size)] for i in range(size)]
+        self.cols = [[i * size + j for i in range(size)] for j in range(size)]
+        self.goal_row = [idx // size for idx in self.goal_index]
+        self.goal_col = [idx % size for idx in self.goal_index]
+
+    def line_conflicts(self, packed, cells, line, goal_line, goal_coord):
+        # Tiles that must leave the line so the rest are in goal order:
+        # line length minus the longest increasing run of goal coordinates.
+        seq = []
+        bits, mask = self.codec.bits, self.codec.mask
+        for cell in cells:
+            tile = (packed >> (cell * bits)) & mask
+            if tile and goal_line[tile] == line:
+                seq.append(goal_coord[tile])
+        tails = []
+        for x in seq:
+            k = bisect_left(tails, x)
+            if k == len(tails):
+                tails.append(x)
+            else:
+                tails[k] = x
+        return len(seq) - len(tails)
+
+    def row_conflicts(self, packed, i):
+        return self.line_conflicts(packed, self.rows[i], i, self.goal_row, self.goal_col)
+
+    def col_conflicts(self, packed, j):
+        return self.line_conflicts(packed, self.cols[j], j, self.goal_col, self.goal_row)
+
+    def initial(self, packed):
+        conflicts = 0
+        for k in range(self.codec.size):
+            conflicts += self.row_conflicts(packed, k) + self.col_conflicts(packed, k)
+        return self.manhattan(packed) + 2 * conflicts
+
+    def update(self, value, parent, child, tile, src, dst):
+        value += self.distance[tile][dst] - self.distance[tile][src]
+        size = self.codec.size
+        if src % size == dst % size:
+            # Vertical move: only the rows the tile leaves and enters change.
+            lines, conflicts = (src // size, dst // size), self.row_conflicts
+        else:
+            lines, conflicts = (src % size, dst % size), self.col_conflicts
+        for line in lines:
+            value += 2 * (conflicts(child, line) - conflicts(parent, line))
+        return value
+
+
+class NilsonHeuristic(Heuristic):
+    # Nilsson's sequence score; not admissible, kept for comparison.
+    def __init__(self, goal_state):
+        super().__init__(goal_state)
+        size = self.codec.size
+        # Outer ring clockwise from the top-left corner ([0, 1, 2, 5, 8, 7, 6, 3] on 3x3).
+        self.spiral = ([j for j in range(size)]
+                       + [i * size + size - 1 for i in range(1, size)]
+                       + [(size - 1) * size + j for j in range(size - 2, -1, -1)]
+                       + [i * size for i in range(size - 2, 0, -1)])
+        self.center = self.codec.cells // 2 if size % 2 else None
+
+    def sequence_score(self, packed):
+        bits, mask = self.codec.bits, self.codec.mask
+        vals = [(packed >> (idx * bits)) & mask for idx in self.spiral]
+        ring = len(vals)
+        score = 0
+        for idx in range(ring - 1):
+            if (vals[idx] + 1) % ring != vals[idx + 1] % ring:
+                score += 2
+        if self.center is not None and (packed >> (self.center * bits)) & mask != 0:
+            score += 1
+        return score
+
+    def initial(self, packed):
+        return self.manhattan(packed) + self.sequence_score(packed)
+
+    def update(self, value, parent, child, tile, src, dst):
+        value += self.distance[tile][dst] - self.distance[tile][src]
+        return value + self.sequence_score(child) - self.sequence_score(parent)
+
+
+class PatternDBHeuristic(Heuristic):
+    def __init__(self, goal_state):
+        super().__init__(goal_state)
+        self.db = PatternDatabase.for_goal(goal_state)
+        self.group_of = {}  # tile -> (group, offset, weight of tile in the index)
+        for group, offset in self.db.layout:
+            for k, tile in enumerate(group):
+                self.group_of[tile] = (group, offset, self.codec.cells ** (len(group) - 1 - k))
+
+    def initial(self, packed):
+        return self.db.value(packed)
+
+    def update(self, value, parent, child, tile, src, dst):
+        # Only the moved tile's group changes, and its index shifts linearly.
+        group, offset, weight = self.group_of[tile]
+        index = self.db.group_index(parent, group)
+        table = self.db.table
+        return value - table[offset + index] + table[offset + index + (dst - src) * weight]
+
+
+HEURISTIC_CLASSES = {
+    "manhattan": ManhattanHeuristic,
+    "linear_conflict": LinearConflictHeuristic,
+    "nilson": NilsonHeuristic,
+    "pattern_db": PatternDBHeuristic,
+}
+_HEURISTIC_CACHE = {}
+
+
+def get_heuristic(name: str, goal_state: List[List[int]]) -> Heuristic:
+    if name not in HEURISTIC_CLASSES:
+        raise ValueError(f"Unknown heuristic: {name}")
+    key = (name, len(goal_state), codec_for(goal_state).pack(goal_state))
+    if key not in _HEURISTIC_CACHE:
+        _HEURISTIC_CACHE[key] = HEURISTIC_CLASSES[name](goal_state)
+    return _HEURISTIC_CACHE[key]
+
 
 # --------- A* Search -----------
 class AstarSearch(SearchingStrategy):
-    def __init__(self):
-        pass
+    HEURISTICS = list(HEURISTIC_CLASSES)
+    ADMISSIBLE = ("manhattan", "linear_conflict", "pattern_db")
+    OPTIONS = ()  # extra keyword arguments make_searcher may pass
+    optimal = True
+    weight = 1  # f = g + weight * h
+
+    def __init__(self, heuristic: str = "manhattan"):
+        if heuristic not in HEURISTIC_CLASSES:
+            raise ValueError(f"Unknown heuristic: {heuristic}")
+        self.heuristic = heuristic
+        self.optimal = self.optimal and heuristic in self.ADMISSIBLE
+        super().__init__()
 
     def heuristic_Manhattan(self, state, goal):
-        # Manhattan distance
-        total = 0
-        for i in range(3):
-            for j in range(3):
-                val = state[i][j]
-                if val != 0:
-                    for x in range(3):
-                        for y in range(3):
-                            if goal[x][y] == val:
-                                total += abs(x - i) + abs(y - j)
-        return total
-    
+        return get_heuristic("manhattan", goal).initial(codec_for(state).pack(state))
+
     def heuristic_Nilson(self, state, goal):
-        def manhattan():
-            return self.heuristic_Manhattan(state, goal)
-
-        seq_score = 0
-        spiral_order = [(0,0),(0,1),(0,2),(1,2),(2,2),(2,1),(2,0),(1,0)]
-        spiral_vals = [state[i][j] for i, j in spiral_order]
-        for idx in range(len(spiral_vals) - 1):
-            if (spiral_vals[idx] + 1) % 8 != spiral_vals[idx + 1] % 8:
-                seq_score += 2
-        if state[1][1] != 0:
-            seq_score += 1
-        return manhattan() + seq_score
+        return get_heuristic("nilson", goal).initial(codec_for(state).pack(state))
 
     def heuristic_LinearConflict(self, state, goal):
-        def manhattan():
-            return self.heuristic_Manhattan(state, goal)
-
-        def find_conflicts(line, goal_line):
-            conflict = 0
-            for i in range(len(line)):
-                for j in range(i + 1, len(line)):
-                    if line[i] in goal_line and line[j] in goal_line:
-                        if goal_line.index(line[i]) > goal_line.index(line[j]):
-                            conflict += 1
-            return conflict
-
-        linear_conflict = 0
-        for i in range(3):
-            row = state[i]
-            goal_row = [goal[i][j] for j in range(3)]
-            linear_conflict += find_conflicts(row, goal_row)
+        return get_heuristic("linear_conflict", goal).initial(codec_for(state).pack(state))
 
-            col = [state[j][i] for j in range(3)]
-            goal_col = [goal[j][i] for j in range(3)]
-            linear_conflict += find_conflicts(col, goal_col)
-        return manhattan() + 2 * linear_conflict
-
-    def heuristic_PatternDB(self, state, goal):
-        # Simulate with Manhattan distance over two subsets
-        subset1 = {1, 2, 3, 4}
-        subset2 = {5, 6, 7, 8}
-        dist1 = 0
-        dist2 = 0
-        goal_pos = {val: (i, j) for i in range(3) for j in range(3) if goal[i][j] != 0 for val in [goal[i][j]]}
-        for i in range(3):
-            for j in range(3):
-                val = state[i][j]
-                if val in goal_pos:
-                    goal_i, goal_j = goal_pos[val]
-                    if val in subset1:
-                        dist1 += abs(i - goal_i) + abs(j - goal_j)
-                    elif val in subset2:
-                        dist2 += abs(i - goal_i) + abs(j - goal_j)
-        return dist1 + dist2
-    
     def heuristic_PatternDB(self, state, goal):
-        return 0
+        return get_heuristic("pattern_db", goal).initial(codec_for(state).pack(state))
 
     def search(self, init_state, goal_state):
-        root = Node(init_state, None, None, self.heuristic_Manhattan(init_state, goal_state), 0)
-        frontier = []
-        heapq.heappush(frontier, root)
-        visited = set()
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        start = codec.pack(init_state)
+        goal = codec.pack(goal_state)
+        heuristic = get_heuristic(self.heuristic, goal_state)
+        successors = self.timed("successors", codec.successors)
+        update = self.timed("heuristic", heuristic.update)
+        push = self.timed("frontier", heapq.heappush)
+        pop = self.timed("frontier", heapq.heappop)
+
+        best_g = {start: 0}
+        parents = {start: (None, None)}
+        closed = set()
+        counter = 0
+        weight = self.weight
+        h = heuristic.initial(start)
+        # Entries are (f, h, counter, g, state, blank): equal f prefers the
+        # smaller h (closer to the goal), then insertion order.
+        frontier = [(weight * h, h, counter, 0, start, codec.find_blank(start))]
 
         while frontier:
-            node = heapq.heappop(frontier)
-            if node.state == goal_state:
-                return node
-            visited.add(str(node.state))
+            if len(frontier) > stats["frontier_peak"]:
+                stats["frontier_peak"] = len(frontier)
+            _, h, _, g, packed, blank = pop(frontier)
+            if g > best_g[packed]:
+                continue  # stale entry, a cheaper path was pushed later
+            if packed == goal:
+                stats["visited_peak"] = len(best_g)
+                return codec.build_path(parents, packed)
+            closed.add(packed)
+            stats["expanded"] += 1
 
-            for action, new_state in State(node.state).successors():
-                if str(new_state) not in visited:
-                    cost = self.heuristic_Manhattan(new_state, goal_state)
-                    child = Node(new_state, node, action, cost, node.depth + 1)
-                    heapq.heappush(frontier, child)
+            child_g = g + 1
+            for action, child, child_blank in successors(packed, blank):
+                if child_g >= best_g.get(child, child_g + 1):
+                    continue
+                if child in closed:
+                    closed.discard(child)
+                    stats["reopened"] += 1
+                best_g[child] = child_g
+                parents[child] = (packed, action)
+                tile = (packed >> (child_blank * codec.bits)) & codec.mask
+                child_h = update(h, packed, child, tile, child_blank, blank)
+                counter += 1
+                push(frontier, (child_g + weight * child_h, child_h, counter, child_g, child, child_blank))
+                stats["generated"] += 1
+        stats["visited_peak"] = len(best_g)
         return None
 
 
+# --------- IDA* Search -----------
+class IDAStarSearch(AstarSearch):
+    """Iterative deepening on f = g + h over one board that is moved and undone in place.
+
+    Memory is O(depth): an explicit stack of (blank, previous blank, h, next
+    move) frames replaces recursion, and the move back to the previous blank
+    is never tried.
+    """
+
+    def __init__(self, heuristic: str = "manhattan", max_bound: Optional[int] = None):
+        super().__init__(heuristic)
+        self.max_bound = max_bound
+
+    def search(self, init_state, goal_state):
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        stats["iterations"] = 0
+        goal = codec.pack(goal_state)
+        heuristic = get_heuristic(self.heuristic, goal_state)
+        update = self.timed("heuristic", heuristic.update)
+        move_table = codec.move_table
+        bits, mask = codec.bits, codec.mask
+
+        packed = codec.pack(init_state)
+        if not codec.is_solvable(packed, goal):
+            return None  # every bound would be exceeded forever
+        root_blank = codec.find_blank(packed)
+        root_h = bound = heuristic.initial(packed)
+        actions = []
+
+        while self.max_bound is None or bound <= self.max_bound:
+            stats["iterations"] += 1
+            next_bound = None
+            stack = [[root_blank, -1, root_h, 0]]
+            while stack:
+                if packed == goal:
+                    return codec.replay(init_state, actions)
+                frame = stack[-1]
+                blank, prev, h, k = frame
+                moves = move_table[blank]
+                if k == 0:
+                    stats["expanded"] += 1
+                    if len(stack) > stats["frontier_peak"]:
+                        stats["frontier_peak"] = len(stack)
+                if k == len(moves):
+                    stack.pop()
+                    if stack:  # undo the move that led here
+                        tile = (packed >> (prev * bits)) & mask
+                        packed ^= (tile << (prev * bits)) ^ (tile << (blank * bits))
+                        actions.pop()
+                    continue
+                frame[3] = k + 1
+                action, target = moves[k]
+                if target == prev:
+                    continue
+                shift = target * bits
+                tile = (packed >> shift) & mask
+                child = packed ^ (tile << shift) ^ (tile << (blank * bits))
+                child_h = update(h, packed, child, tile, target, blank)
+                stats["generated"] += 1
+                f = len(stack) + child_h
+                if f > bound:
+                    if next_bound is None or f < next_bound:
+                        next_bound = f
+                    continue
+                packed = child
+                actions.append(action)
+                stack.append([target, blank, child_h, 0])
+            if next_bound is None:
+                return None
+            bound = next_bound
+        return None
+
+
+# --------- Greedy Best-First Search -----------
+class GreedySearch(AstarSearch):
+    """Expands the node with the lowest h only; fast, but not optimal."""
+    optimal = False
+
+    def search(self, init_state, goal_state):
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        start = codec.pack(init_state)
+        goal = codec.pack(goal_state)
+        heuristic = get_heuristic(self.heuristic, goal_state)
+        successors = self.timed("successors", codec.successors)
+        update = self.timed("heuristic", heuristic.update)
+        push = self.timed("frontier", heapq.heappush)
+        pop = self.timed("frontier", heapq.heappop)
+
+        parents = {start: (None, None)}
+        counter = 0
+        frontier = [(heuristic.initial(start), counter, start, codec.find_blank(start))]
+
+        while frontier:
+            if len(frontier) > stats["frontier_peak"]:
+                stats["frontier_peak"] = len(frontier)
+            h, _, packed, blank = pop(frontier)
+            if packed == goal:
+                stats["visited_peak"] = len(parents)
+                return codec.build_path(parents, packed)
+            stats["expanded"] += 1
+
+            for action, child, child_blank in successors(packed, blank):
+                if child in parents:
+                    continue
+                parents[child] = (packed, action)
+                tile = (packed >> (child_blank * codec.bits)) & codec.mask
+                counter += 1
+                push(frontier, (update(h, packed, child, tile, child_blank, blank), counter, child, child_blank))
+                stats["generated"] += 1
+        stats["visited_peak"] = len(parents)
+        return None
+
+
+# --------- Bounded-Suboptimal and Anytime Search -----------
+class WeightedAstarSearch(AstarSearch):
+    """A* on f = g + w*h; with an admissible heuristic the path is at most w times optimal."""
+    OPTIONS = ("weight",)
+
+    def __init__(self, heuristic: str = "manhattan", weight: float = 2.0):
+        if weight < 1:
+            raise ValueError(f"Weight must be at least 1, got {weight}")
+        super().__init__(heuristic)
+        self.weight = weight
+        self.optimal = self.optimal and weight == 1
+
+    def search(self, init_state, goal_state):
+        node = super().search(init_state, goal_state)
+        self.stats["bound"] = self.weight if self.heuristic in self.ADMISSIBLE else None
+        return node
+
+
+class ARAStarSearch(AstarSearch):
+    """Anytime repairing A*: weighted A* passes with a falling weight that reuse earlier work.
+
+    The first solution is always waited for; after that the search stops at
+    `time_limit` seconds and returns the best path so far.  stats["bound"] is
+    the proven suboptimality factor of that path and stats["solutions"] lists
+    [length, bound, seconds] for each improvement.
+    """
+    OPTIONS = ("weight", "step", "time_limit")
+    cacheable = False
+    optimal = False
+
+    def __init__(self, heuristic: str = "manhattan", weight: float = 3.0, step: float = 0.5,
+                 time_limit: Optional[float] = 1.0):
+        if weight < 1:
+            raise ValueError(f"Weight must be at least 1, got {weight}")
+        if step <= 0:
+            raise ValueError(f"Step must be positive, got {step}")
+        super().__init__(heuristic)
+        self.initial_weight = weight
+        self.step = step
+        self.time_limit = time_limit
+
+    def search(self, init_state, goal_state):
+        self.reset_stats()
+        codec = codec_for(init_state)
+        stats = self.stats
+        stats["solutions"] = []
+        stats["bound"] = None
+        started = time.perf_counter()
+        deadline = None if self.time_limit is None else started + self.time_limit
+        start = codec.pack(init_state)
+        goal = codec.pack(goal_state)
+        if not codec.is_solvable(start, goal):
+            return None
+        heuristic = get_heuristic(self.heuristic, goal_state)
+        successors = self.timed("successors", codec.successors)
+        update = self.timed("heuristic", heuristic.update)
+        bits, mask = codec.bits, codec.mask
+
+        g = {start: 0}
+        h_of = {start: heuristic.initial(start)}
+        blank_of = {start: codec.find_blank(start)}
+        parents = {start: (None, None)}
+        open_f = {}  # state -> f of its live heap entry
+        frontier = []
+        closed = set()
+        incons = set()
+        counter = 0
+        weight = self.initial_weight
+        proven = None  # weight of the last pass that ran to completion
+        best, best_cost = None, None
+
+        def push(state):
+            nonlocal counter
+            counter += 1
+            f = g[state] + weight * h_of[state]
+            open_f[state] = f
+            heapq.heappush(frontier, (f, h_of[state], counter, state))
+
+        def improve_path():
+            # Expand while something on OPEN could still beat the current goal cost.
+            while frontier:
+                f, _, _, packed = frontier[0]
+                if open_f.get(packed) != f:
+                    heapq.heappop(frontier)  # stale
+                    continue
+                if f >= g.get(goal, float("inf")):
+                    return True
+                if best is not None and deadline is not None and not stats["expanded"] & 255 \
+                        and time.perf_counter() > deadline:
+                    return False
+                heapq.heappop(frontier)
+                del open_f[packed]
+                closed.add(packed)
+                stats["expanded"] += 1
+                if len(frontier) > stats["frontier_peak"]:
+                    stats["frontier_peak"] = len(frontier)
+                blank = blank_of[packed]
+                child_g = g[packed] + 1
+                for action, child, child_blank in successors(packed, blank):
+                    if child_g >= g.get(child, child_g + 1):
+                        continue
+                    g[child] = child_g
+                    parents[child] = (packed, action)
+                    if child not in h_of:
+                        tile = (packed >> (child_blank * bits)) & mask
+                        h_of[child] = update(h_of[packed], packed, child, tile, child_blank, blank)
+                        blank_of[child] = child_blank
+                    stats["generated"] += 1
+                    if child in closed:
+                        incons.add(child)
+                    else:
+                        push(child)
+            return True
+
+        push(start)
+        while True:
+            finished = improve_path()
+            if finished:
+                proven = weight
+            if goal in g and (best is None or g[goal] < best_cost):
+                best, best_cost = codec.build_path(parents, goal), g[goal]
+                stats["solutions"].append([best_cost, None, round(time.perf_counter() - started, 6)])
+                stats["bound"] = None
+            if best is not None:
+                # Every state left on OPEN or INCONS bounds the optimal cost from below;
+                # a pass only proves its weight once it has run to completion.
+                lower = min((g[s] + h_of[s] for s in chain(open_f, incons)), default=best_cost)
+                bound = best_cost / lower if lower else 1.0
+                if proven is not None:
+                    bound = min(proven, bound)
+                bound = max(1.0, bound)
+                if stats["bound"] is None or bound < stats["bound"]:
+                    stats["bound"] = bound
+                    stats["solutions"][-1][1] = round(bound, 4)
+            if not finished or stats["bound"] is None or stats["bound"] <= 1:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            weight = max(1.0, weight - self.step)
+            # Next pass: INCONS rejoins OPEN, everything re-keyed under the new weight.
+            states = list(open_f) + list(incons)
+            open_f.clear()
+            incons.clear()
+            closed.clear()
+            frontier.clear()
+            for state in states:
+                push(state)
+        stats["visited_peak"] = len(g)
+        stats["weight"] = weight
+        return best
+
+
+# --------- Solution Cache -----------
+def node_moves(node: Optional[Node]) -> Optional[str]:
+    """U/D/L/R letters from the root to `node`, or None when there is no node."""
+    if node is None:
+        return None
+    moves = []
+    while node.action is not None:
+        moves.append(MOVE_LETTERS[node.action])
+        node = node.parent
+    return "".join(reversed(moves))
+
+
+def strategy_key(searcher: SearchingStrategy) -> str:
+    heuristic = getattr(searcher, "heuristic", None)
+    weight = getattr(searcher, "weight", 1)
+    return type(searcher).__name__ + (f":{heuristic}" if heuristic else "") + (f":w{weight:g}" if weight != 1 else "")
+
+
+class SolutionCache:
+    """LRU of solutions keyed on (size, start, goal, strategy), optionally backed by sqlite.
+
+    Optimal solutions also index every suffix of their path: each board on
+    the way maps to the remaining moves, so queries from those boards hit
+    too.  Suffix entries share the full move string and only store an offset.
+    """
+
+    def __init__(self, capacity: int = 100_000, path: Optional[str] = None):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # key -> (moves or None, offset)
+        self.metrics = {"hits": 0, "suffix_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.db = None
+        if path:
+            # WAL + a busy timeout let several batch workers share one file.
+            self.db = sqlite3.connect(path, timeout=30)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, moves TEXT)")
+
+    def key(self, codec, start: int, goal: int, strategy: str) -> str:
+        return f"{codec.size}:{start:x}:{goal:x}:{strategy}"
+
+    def get(self, codec, start: int, goal: int, strategy: str):
+        """Return (found, moves); moves is None for a cached "no solution"."""
+        key = self.key(codec, start, goal, strategy)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            moves, offset = entry
+            self.metrics["suffix_hits" if offset else "hits"] += 1
+            return True, None if moves is None else moves[offset:]
+        if self.db is not None:
+            row = self.db.execute("SELECT moves FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.metrics["disk_hits"] += 1
+                self.remember(key, row[0], 0)
+                return True, row[0]
+        self.metrics["misses"] += 1
+        return False, None
+
+    def put(self, codec, start: int, goal: int, strategy: str, moves: Optional[str], optimal: bool = False):
+        keys = [(self.key(codec, start, goal, strategy), 0)]
+        if optimal and moves:
+            packed, blank = start, codec.find_blank(start)
+            for offset, letter in enumerate(moves, 1):
+                for action, child, child_blank in codec.successors(packed, blank):
+                    if MOVE_LETTERS[action] == letter:
+                        packed, blank = child, child_blank
+                        break
+                keys.append((self.key(codec, packed, goal, strategy), offset))
+        for key, offset in keys:
+            self.remember(key, moves, offset)
+        if self.db is not None:
+            rows = [(key, None if moves is None else moves[offset:]) for key, offset in keys]
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO solutions (key, moves) VALUES (?, ?)", rows)
+
+    def remember(self, key, moves, offset):
+        self.entries[key] = (moves, offset)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
 # --------- Game Manager -----------
 class GameManager:
-    def __init__(self, init_state, goal_state, searcher: SearchingStrategy):
+    def __init__(self, init_state, goal_state, searcher: SearchingStrategy, cache: Optional[SolutionCache] = None):
         self.init_state = init_state
         self.goal_state = goal_state
         self.searcher = searcher
+        self.cache = cache
+
+    def is_solvable(self):
+        codec = codec_for(self.init_state)
+        return codec.is_solvable(codec.pack(self.init_state), codec.pack(self.goal_state))
 
     def solve(self):
-        return self.searcher.search(self.init_state, self.goal_state)
+        # Opposite-parity boards would otherwise exhaust all 9!/2 reachable states.
+        if not self.is_solvable():
+            return None
+        if self.cache is None or not self.searcher.cacheable:
+            return self.searcher.search(self.init_state, self.goal_state)
+
+        codec = codec_for(self.init_state)
+        start, goal = codec.pack(self.init_state), codec.pack(self.goal_state)
+        strategy = strategy_key(self.searcher)
+        found, moves = self.cache.get(codec, start, goal, strategy)
+        if found:
+            self.searcher.reset_stats()
+            return None if moves is None else codec.replay(self.init_state, moves)
+        node = self.searcher.search(self.init_state, self.goal_state)
+        self.cache.put(codec, start, goal, strategy, node_moves(node), self.searcher.optimal)
+        return node
 
     def print_solution(self, node):
         path = []
@@ -245,8 +1303,11 @@ class GameManager:
             print()
 
 
+# tkinter is imported where the GUI needs it, so headless users (batch, service.py) work without Tk.
 class PuzzleGUI:
     def __init__(self, master):
+        import tkinter as tk
+        from tkinter import ttk
         self.master = master
         self.master.title("8-Puzzle Solver")
         self.master.geometry("400x500")  # Optional initial size
@@ -259,9 +1320,10 @@ class PuzzleGUI:
 
         self.entries = [[None]*3 for _ in range(3)]
         self.create_grid()
+        self.cache = SolutionCache()
 
         self.algorithm_var = tk.StringVar(value="A*")
-        self.algo_dropdown = ttk.Combobox(master, textvariable=self.algorithm_var, values=["A*", "BFS", "DFS", "IDDFS", "Greedy"])
+        self.algo_dropdown = ttk.Combobox(master, textvariable=self.algorithm_var, values=["A*", "IDA*", "BFS", "BiBFS", "DFS", "IDDFS", "Table", "Greedy", "Weighted A*", "ARA*"])
         self.algo_dropdown.grid(row=3, column=0, columnspan=3, pady=5, sticky="nsew")
 
         self.solve_button = tk.Button(master, text="Solve", command=self.solve_puzzle)
@@ -271,6 +1333,7 @@ class PuzzleGUI:
         self.output_label.grid(row=5, column=0, columnspan=3, sticky="nsew")
 
     def create_grid(self):
+        import tkinter as tk
         for i in range(3):
             for j in range(3):
                 entry = tk.Entry(self.master, width=3, justify='center', font=("Arial", 24))
@@ -279,6 +1342,7 @@ class PuzzleGUI:
 
 
     def get_initial_state(self):
+        from tkinter import messagebox
         try:
             state = []
             used = set()
@@ -297,6 +1361,7 @@ class PuzzleGUI:
             return None
 
     def solve_puzzle(self):
+        from tkinter import messagebox
         init_state = self.get_initial_state()
         if init_state is None:
             return
@@ -307,18 +1372,33 @@ class PuzzleGUI:
 
         if selected_algo == "A*":
             searcher = AstarSearch()
+        elif selected_algo == "IDA*":
+            searcher = IDAStarSearch()
         elif selected_algo == "BFS":
             searcher = BFSearch()
+        elif selected_algo == "BiBFS":
+            searcher = BidirectionalBFSearch()
         elif selected_algo == "DFS":
             searcher = DFSearch()
         elif selected_algo == "IDDFS":
             searcher = IDDFSearch()
+        elif selected_algo == "Table":
+            searcher = DistanceTableSearch()
+        elif selected_algo == "Greedy":
+            searcher = GreedySearch()
+        elif selected_algo == "Weighted A*":
+            searcher = WeightedAstarSearch()
+        elif selected_algo == "ARA*":
+            searcher = ARAStarSearch()
         else:
             messagebox.showerror("Error", "Unknown algorithm selected.")
             return
 
 
-        manager = GameManager(init_state, goal, searcher)
+        manager = GameManager(init_state, goal, searcher, self.cache)
+        if not manager.is_solvable():
+            self.output_label.config(text="Unsolvable: this board cannot reach the goal.")
+            return
         start = time.time()
         result = manager.solve()
         end = time.time()
@@ -334,12 +1414,456 @@ class PuzzleGUI:
             result = result.parent
 
         self.output_label.config(
-		    text=f"Solution: {' '.join(reversed(path))}\nMoves: {len(path)}\nTime: {end-start:.4f}s"
+		    text=f"Solution: {' '.join(reversed(path))}\nMoves: {len(path)}\nTime: {end-start:.4f}s\n"
+		         f"Expanded: {searcher.stats['expanded']}"
+		         + (f"\nWithin {searcher.stats['bound']:.2f}x optimal" if searcher.stats.get('bound') else "")
 		)
 
 
+# --------- Puzzle Files -----------
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "100_Solvable_8-Puzzle_Cases.csv")
+DEFAULT_GOAL = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+
+
+def default_goal(size: int) -> List[List[int]]:
+    """Tiles in order with the blank last, e.g. DEFAULT_GOAL for size 3."""
+    flat = list(range(1, size * size)) + [0]
+    return [flat[i:i + size] for i in range(0, size * size, size)]
+
+
+def iter_entries(path: str = CASES_FILE):
+    """Unparsed boards: lists of cell strings from a Row1,Row2,Row3 CSV, or lines of a one-board-per-line file."""
+    with open(path, newline="") as f:
+        first = f.readline()
+        if first.startswith("Row1"):
+            for row in csv.reader(f):
+                if row:
+                    yield row
+            return
+        for line in chain([first], f):
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line
+
+
+def iter_cases(path: str = CASES_FILE):
+    """Stream boards from a Row1,Row2,Row3 CSV or a one-board-per-line file."""
+    return map(parse_case, iter_entries(path))
+
+
+def load_cases(path: str = CASES_FILE) -> List[List[List[int]]]:
+    return list(iter_cases(path))
+
+
+def parse_board(text: str) -> List[List[int]]:
+    if text.isdigit() and len(text) <= 9:
+        values = [int(v) for v in text]  # compact form: 123456780
+    else:
+        values = [int(v) for v in text.replace(",", " ").split()]
+    size = int(round(len(values) ** 0.5))
+    if size * size != len(values):
+        raise ValueError(f"{len(values)} values do not make a square board: {text!r}")
+    return check_board([values[i:i + size] for i in range(0, len(values), size)])
+
+
+def check_board(board: List[List[int]]) -> List[List[int]]:
+    """Return `board` if it is NxN (N >= 2) and holds each of 0..N*N-1 once, else raise ValueError."""
+    size = len(board)
+    values = [v for row in board for v in row]
+    if size < 2 or any(len(row) != size for row in board) or sorted(values) != list(range(size * size)):
+        raise ValueError(f"Not an NxN board of the tiles 0..N*N-1: {board}")
+    return board
+
+
+def parse_case(entry) -> List[List[int]]:
+    """A board from a line of text, a row of CSV cells like '[1, 2, 3]', or an already-built board."""
+    if isinstance(entry, str):
+        return parse_board(entry)
+    if entry and isinstance(entry[0], str):
+        return check_board([ast.literal_eval(cell) for cell in entry])
+    return check_board(entry)
+
+
+def parse_partition(text: str):
+    return tuple(tuple(int(t) for t in group.split(",")) for group in text.split("/"))
+
+
+# --------- Batch Solver -----------
+STRATEGIES = {
+    "astar": AstarSearch,
+    "idastar": IDAStarSearch,
+    "greedy": GreedySearch,
+    "weighted": WeightedAstarSearch,
+    "arastar": ARAStarSearch,
+    "bfs": BFSearch,
+    "bibfs": BidirectionalBFSearch,
+    "dfs": DFSearch,
+    "iddfs": IDDFSearch,
+    "table": DistanceTableSearch,  # 3x3 only
+}
+RESULT_FIELDS = ["index", "board", "status", "length", "moves", "expanded", "time", "bound", "error"]
+
+
+def make_searcher(name: str, heuristic: str = "manhattan", **options) -> SearchingStrategy:
+    """Options the strategy does not take (see AstarSearch.OPTIONS) or that are None are ignored."""
+    cls = STRATEGIES[name]
+    if not issubclass(cls, AstarSearch):
+        return cls()
+    return cls(heuristic, **{k: v for k, v in options.items() if k in cls.OPTIONS and v is not None})
+
+
+class InstanceTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise InstanceTimeout()
+
+
+_worker_cache = None
+
+
+def _init_worker(memory_mb, cache_path=None):
+    global _worker_cache
+    if memory_mb:
+        # Unix only: the cap covers the whole worker, so a runaway search hits
+        # MemoryError instead of swapping the machine.
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+    if cache_path:
+        _worker_cache = SolutionCache(path=cache_path)
+
+
+def solve_instance(searcher, index, board, goal=None, timeout=None, cache=None):
+    """Solve one board (or unparsed entry, see iter_entries) into a result record.
+
+    Failures are recorded per instance: status "timeout", "memory" or
+    "error" with the exception in "error"; with `goal=None` the board is
+    solved towards default_goal() of its own size.
+    """
+    record = dict.fromkeys(RESULT_FIELDS)
+    record.update(index=index, board=board if isinstance(board, str) else str(board))
+    searcher.reset_stats()
+    start = time.perf_counter()
+    # The timer lives in the inner try, so an alarm that fires while it is
+    # being disarmed still lands in the handlers below.
+    try:
+        if timeout:
+            if not hasattr(signal, "setitimer"):
+                raise ValueError("Per-instance timeouts need SIGALRM (Unix only)")
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            board = parse_case(board)
+            record["board"] = " ".join(str(v) for row in board for v in row)
+            manager = GameManager(board, goal or default_goal(len(board)), searcher, cache)
+            node = manager.solve()
+            record["status"] = "solved" if node else "unsolved" if manager.is_solvable() else "unsolvable"
+        finally:
+            if timeout:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except InstanceTimeout:
+        node, record["status"] = None, "timeout"
+    except MemoryError:
+        node, record["status"] = None, "memory"
+    except Exception as exc:
+        node, record["status"] = None, "error"
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["time"] = round(time.perf_counter() - start, 6)
+    record["expanded"] = searcher.stats["expanded"]
+    record["bound"] = searcher.stats.get("bound")
+    if node:
+        record["moves"] = node_moves(node)
+        record["length"] = len(record["moves"])
+    return record
+
+
+def solve_chunk(chunk, goal, strategy, heuristic, timeout, options=None):
+    searcher = make_searcher(strategy, heuristic, **(options or {}))
+    return [solve_instance(searcher, index, board, goal, timeout, _worker_cache) for index, board in chunk]
+
+
+class ResultWriter:
+    """Appends one record per line (CSV or JSONL, chosen by extension) and flushes each write."""
+
+    def __init__(self, path: str):
+        self.file = sys.stdout if path == "-" else open(path, "w", newline="")
+        self.csv = None
+        if path.endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv:
+            self.csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def run_batch(paths, goal, writer, strategy="astar", heuristic="manhattan",
+              workers=None, chunksize=8, timeout=None, memory_mb=None, cache_path=None, options=None):
+    """Solve every board in `paths` across a process pool, writing results in input order.
+
+    With `goal=None` each board is solved towards default_goal() of its own size.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Build on-disk tables once here rather than in every worker.
+    if heuristic == "pattern_db" and issubclass(STRATEGIES[strategy], AstarSearch):
+        get_heuristic(heuristic, goal or DEFAULT_GOAL)
+    elif strategy == "table" and len(goal or DEFAULT_GOAL) == 3:
+        DistanceTable.for_goal(goal or DEFAULT_GOAL)
+    # Boards are parsed in the workers, so a malformed line becomes an "error" record.
+    cases = enumerate(chain.from_iterable(iter_entries(path) for path in paths))
+    counts = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(memory_mb, cache_path)) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(cases, chunksize))
+            if chunk:
+                pending.append(pool.submit(solve_chunk, chunk, goal, strategy, heuristic, timeout, options))
+            # Keep a bounded window in flight so huge inputs stream through.
+            while pending and (not chunk or len(pending) >= 2 * workers):
+                for record in pending.popleft().result():
+                    writer.write(record)
+                    counts[record["status"]] = counts.get(record["status"], 0) + 1
+            if not chunk:
+                return counts
+
+
+# --------- Benchmark -----------
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+UNINFORMED = ("bfs", "bibfs", "dfs", "iddfs", "table")
+TIME_NOISE_FLOOR = 0.0005  # seconds; smaller p50/p90 changes are never flagged
+PORTABLE_FIELDS = ("cases", "solved", "length", "expanded", "generated")  # same on every machine
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def benchmark_config(strategy, heuristic, cases, goal, trace_memory=False, phase_timing=False, repeat=1,
+                     options=None):
+    """Solve every case with one strategy/heuristic pair and aggregate its stats.
+
+    Each case is timed `repeat` times and the fastest run is kept.  On 3x3
+    boards a reported stats["bound"] is checked against the optimal length
+    from the distance table; paths longer than bound x optimal are counted
+    in "bound_violations".
+    """
+    searcher = make_searcher(strategy, heuristic or "manhattan", **(options or {}))
+    codec = codec_for(goal)
+    table = None
+    searcher.phase_timing = phase_timing
+    if heuristic:
+        get_heuristic(heuristic, goal)  # load/build tables outside the timed runs
+    result = {"cases": len(cases), "solved": 0, "length": 0, "expanded": 0, "generated": 0,
+              "frontier_peak": 0, "visited_peak": 0, "memory_peak": 0, "phases": {},
+              "bound_violations": 0, "instrumented": trace_memory or phase_timing}
+    times = []
+    for case in cases:
+        best = None
+        for _ in range(repeat):
+            node = searcher.measure(case, goal, trace_memory)
+            best = searcher.stats["time"] if best is None else min(best, searcher.stats["time"])
+        stats = searcher.stats
+        times.append(best)
+        if node:
+            result["solved"] += 1
+            result["length"] += node.depth
+            if stats.get("bound") and codec.cells == 9:
+                table = table or DistanceTable.for_goal(goal)
+                if node.depth > stats["bound"] * table.distance(codec.pack(case)) + 1e-9:
+                    result["bound_violations"] += 1
+        result["expanded"] += stats["expanded"]
+        result["generated"] += stats["generated"]
+        for peak in ("frontier_peak", "visited_peak", "memory_peak"):
+            result[peak] = max(result[peak], stats.get(peak, 0))
+        for phase, seconds in searcher.phase_times.items():
+            result["phases"][phase] = result["phases"].get(phase, 0.0) + seconds
+    result["time_total"] = sum(times)
+    for q in (50, 90, 99):
+        result[f"time_p{q}"] = percentile(times, q)
+    return result
+
+
+def compare_baseline(results, baseline, tolerance=0.5):
+    """Node counts and solution lengths must not grow; times may grow by `tolerance`.
+
+    Configs run on a different number of cases are skipped, and times are
+    only compared when the baseline has them (see --portable) and neither
+    run had tracemalloc/phase timers on.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None or base["cases"] != result["cases"]:
+            continue
+        if result["solved"] < base["solved"]:
+            regressions.append(f"{key}: solved {result['solved']} < {base['solved']}")
+        for field in ("length", "expanded", "generated"):
+            if result[field] > base[field]:
+                regressions.append(f"{key}: {field} {result[field]} > {base[field]}")
+        if result["instrumented"] or base.get("instrumented") or "time_p50" not in base:
+            continue
+        for field in ("time_p50", "time_p90"):
+            limit = max(base[field] * (1 + tolerance), base[field] + TIME_NOISE_FLOOR)
+            if result[field] > limit:
+                regressions.append(f"{key}: {field} {result[field] * 1e3:.2f}ms > {limit * 1e3:.2f}ms")
+    return regressions
+
+
+# --------- Command Line -----------
+def cmd_build_pdb(args):
+    goal = parse_board(args.goal) if args.goal else default_goal(args.size)
+    db = PatternDatabase(goal, parse_partition(args.partition) if args.partition else None)
+    start = time.perf_counter()
+    db.build()
+    print(f"Wrote {db.path} ({db.table_size} bytes) in {time.perf_counter() - start:.2f}s")
+
+
+def cmd_build_table(args):
+    table = DistanceTable(parse_board(args.goal) if args.goal else DEFAULT_GOAL)
+    start = time.perf_counter()
+    table.build()
+    print(f"Wrote {table.path} ({table.table_size} bytes) in {time.perf_counter() - start:.2f}s")
+
+
+def cmd_benchmark(args):
+    try:
+        for strategy in args.strategies:
+            make_searcher(strategy, weight=args.weight, time_limit=args.budget)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    cases = load_cases(args.cases)[:args.limit]
+    goal = parse_board(args.goal) if args.goal else default_goal(len(cases[0]))
+    results = {}
+    print(f"{'config':<26}{'solved':>7}{'expanded':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'peak KiB':>10}")
+    for strategy in args.strategies:
+        heuristics = [None] if strategy in UNINFORMED else args.heuristics
+        for heuristic in heuristics:
+            key = f"{strategy}/{heuristic or '-'}"
+            result = benchmark_config(strategy, heuristic, cases, goal, args.memory, args.phases, args.repeat,
+                                      {"weight": args.weight, "time_limit": args.budget})
+            results[key] = result
+            memory = f"{result['memory_peak'] / 1024:.0f}" if args.memory else "-"
+            print(f"{key:<26}{result['solved']:>7}{result['expanded']:>10}{result['time_p50'] * 1e3:>9.2f}"
+                  f"{result['time_p90'] * 1e3:>9.2f}{result['time_p99'] * 1e3:>9.2f}{memory:>10}")
+            for phase, seconds in result["phases"].items():
+                print(f"    {phase:<22}{seconds:>10.3f}s")
+
+    violations = [f"{key}: {result['bound_violations']} paths longer than bound x optimal"
+                  for key, result in results.items() if result["bound_violations"]]
+    for line in violations:
+        print("BOUND", line, file=sys.stderr)
+    if violations:
+        sys.exit(1)
+    if args.save_baseline:
+        if args.portable:
+            results = {key: {field: result[field] for field in PORTABLE_FIELDS} for key, result in results.items()}
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare_baseline(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+    else:
+        print(f"No baseline at {args.baseline}, nothing compared")
+
+
+def cmd_batch(args):
+    if args.memory_mb and os.name != "posix":
+        sys.exit("--memory-mb needs the Unix resource module")
+    try:
+        make_searcher(args.strategy, args.heuristic, weight=args.weight, time_limit=args.budget)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    writer = ResultWriter(args.output)
+    start = time.perf_counter()
+    try:
+        counts = run_batch(args.files, parse_board(args.goal) if args.goal else None, writer, args.strategy, args.heuristic,
+                           args.workers, args.chunksize, args.timeout, args.memory_mb, args.cache,
+                           {"weight": args.weight, "time_limit": args.budget})
+    finally:
+        writer.close()
+    summary = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items()))
+    print(f"{summary} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+def main_cli(argv):
+    parser = argparse.ArgumentParser(description="Headless 8-puzzle tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build-pdb", help="precompute an additive pattern database")
+    p.add_argument("--goal", default=None, help="defaults to tiles in order, blank last")
+    p.add_argument("--size", type=int, default=3, help="board width when --goal is not given")
+    p.add_argument("--partition", default=None, help="tile groups, e.g. 1,2,3,4/5,6,7,8 (default per size)")
+    p.set_defaults(func=cmd_build_pdb)
+
+    p = sub.add_parser("build-table", help="precompute the perfect distance table for a goal")
+    p.add_argument("--goal", default=None, help="defaults to tiles in order, blank last")
+    p.set_defaults(func=cmd_build_table)
+
+    p = sub.add_parser("benchmark", help="benchmark strategies x heuristics against a baseline")
+    p.add_argument("--cases", default=CASES_FILE)
+    p.add_argument("--limit", type=int, default=None, help="only use the first N cases")
+    p.add_argument("--goal", default=None, help="defaults to tiles in order, blank last")
+    p.add_argument("--strategies", nargs="+", default=["astar", "idastar", "greedy"], choices=list(STRATEGIES),
+                   help="'table' only handles 3x3 cases")
+    p.add_argument("--heuristics", nargs="+", default=["manhattan", "linear_conflict", "pattern_db"],
+                   choices=AstarSearch.HEURISTICS)
+    p.add_argument("--repeat", type=int, default=1, help="time each case N times and keep the fastest")
+    p.add_argument("--weight", type=float, default=None, help="h weight for weighted/arastar")
+    p.add_argument("--budget", type=float, default=None, help="seconds per case for arastar to keep improving")
+    p.add_argument("--memory", action="store_true", help="record tracemalloc peaks (slows searches)")
+    p.add_argument("--phases", action="store_true", help="time successor/heuristic/frontier phases")
+    p.add_argument("--baseline", default=BASELINE_FILE)
+    p.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    p.add_argument("--portable", action="store_true",
+                   help="save only the machine-independent counts, without times (as committed)")
+    p.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    p.set_defaults(func=cmd_benchmark)
+
+    p = sub.add_parser("batch", help="solve puzzle files across a process pool")
+    p.add_argument("files", nargs="*", default=[CASES_FILE],
+                   help="Row1,Row2,Row3 CSV or one board per line (e.g. '1 2 3 4 5 6 7 8 0')")
+    p.add_argument("--goal", default=None, help="defaults to tiles in order, blank last")
+    p.add_argument("--strategy", default="astar", choices=list(STRATEGIES),
+                   help="'table' only handles 3x3 boards; larger ones are recorded as errors")
+    p.add_argument("--heuristic", default="manhattan", choices=AstarSearch.HEURISTICS)
+    p.add_argument("--weight", type=float, default=None, help="h weight for weighted/arastar (initial weight for arastar)")
+    p.add_argument("--budget", type=float, default=None, help="seconds per instance for arastar to keep improving")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--chunksize", type=int, default=8)
+    p.add_argument("--timeout", type=float, default=None, help="seconds per instance")
+    p.add_argument("--memory-mb", type=int, default=None, help="address-space cap per worker")
+    p.add_argument("--cache", default=None, help="sqlite solution cache shared by the workers")
+    p.add_argument("-o", "--output", default="-", help="results file (.csv or .jsonl), '-' for stdout")
+    p.set_defaults(func=cmd_batch)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
 # --------- Example Run with UI -----------
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main_cli(sys.argv[1:])
+        sys.exit()
+    import tkinter as tk
     root = tk.Tk()
     gui = PuzzleGUI(root)
     root.mainloop()
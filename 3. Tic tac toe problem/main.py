@@ -1,110 +1,620 @@
 from dataclasses import dataclass
 from typing import List
-import tkinter as tk
-from tkinter import messagebox
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+# --------- Board Geometry -----------
+# Cell (i, j) is bit i*cols+j.  A position is one bitmask per player.
+class Geometry:
+    MAX_SYMMETRY_COLS = 8   # row lookup tables are 2**cols entries each
+    NEAR_RADIUS = 2         # on large boards only cells near stones are tried
+    NEAR_MIN_CELLS = 26
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(f"win length {k} does not fit a {rows}x{cols} board")
+        self.rows, self.cols, self.k = rows, cols, k
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+
+        self.win_masks = []
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for i in range(rows):
+                for j in range(cols):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < cols:
+                        self.win_masks.append(sum(1 << self.cell(i + di * t, j + dj * t) for t in range(k)))
+        self.cell_lines = [[w for w in self.win_masks if w >> c & 1] for c in range(self.cells)]
+
+        self.near = None
+        if self.cells >= self.NEAR_MIN_CELLS:
+            r = self.NEAR_RADIUS
+            self.near = [sum(1 << self.cell(y, x)
+                             for y in range(max(0, i - r), min(rows, i + r + 1))
+                             for x in range(max(0, j - r), min(cols, j + r + 1)))
+                         for i in range(rows) for j in range(cols)]
+
+        self.sym_cells, self.sym_rows = [[c for c in range(self.cells)]], None
+        if cols <= self.MAX_SYMMETRY_COLS:
+            self.sym_cells = [[self.cell(*f(i, j)) for i in range(rows) for j in range(cols)]
+                              for f in self.symmetries()]
+            self.sym_rows = [[[self.map_mask(bits << (i * cols), cell_map) for bits in range(1 << cols)]
+                              for i in range(rows)] for cell_map in self.sym_cells]
+        self.sym_inverse = [[0] * self.cells for _ in self.sym_cells]
+        for s, cell_map in enumerate(self.sym_cells):
+            for c, t in enumerate(cell_map):
+                self.sym_inverse[s][t] = c
+
+    def cell(self, i, j):
+        return i * self.cols + j
+
+    def symmetries(self):
+        m, n = self.rows - 1, self.cols - 1
+        maps = [lambda i, j: (i, j), lambda i, j: (i, n - j),
+                lambda i, j: (m - i, j), lambda i, j: (m - i, n - j)]
+        if self.rows == self.cols:
+            maps += [lambda i, j: (j, i), lambda i, j: (j, m - i),
+                     lambda i, j: (n - j, i), lambda i, j: (n - j, m - i)]
+        return maps
+
+    @staticmethod
+    def map_mask(mask, cell_map):
+        out = 0
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            out |= 1 << cell_map[bit.bit_length() - 1]
+        return out
+
+    def transform(self, mask, s):
+        rows, cols, row_mask = self.sym_rows[s], self.cols, (1 << self.cols) - 1
+        out = 0
+        for i in range(self.rows):
+            out |= rows[i][(mask >> (i * cols)) & row_mask]
+        return out
+
+    def canonical(self, me, opp):
+        """Smallest (me, opp) encoding over the board symmetries, and the symmetry used."""
+        if self.sym_rows is None:
+            return (me << self.cells) | opp, 0
+        return min(((self.transform(me, s) << self.cells) | self.transform(opp, s), s)
+                   for s in range(len(self.sym_rows)))
+
+    def has_line(self, mask):
+        for win in self.win_masks:
+            if mask & win == win:
+                return True
+        return False
+
+    def wins_at(self, mask, cell):
+        for win in self.cell_lines[cell]:
+            if mask & win == win:
+                return True
+        return False
+
+    def candidates(self, occupied):
+        empty = self.full & ~occupied
+        if self.near is None:
+            return empty
+        if not occupied:
+            return 1 << self.cell(self.rows // 2, self.cols // 2)
+        zone = 0
+        while occupied:
+            bit = occupied & -occupied
+            occupied ^= bit
+            zone |= self.near[bit.bit_length() - 1]
+        return (empty & zone) or empty
+
+    def evaluate(self, me, opp):
+        """Open-line count weighted by stones, from the side to move."""
+        score = 0
+        for win in self.win_masks:
+            mine, theirs = me & win, opp & win
+            if mine and not theirs:
+                score += LINE_WEIGHTS[mine.bit_count()]
+            elif theirs and not mine:
+                score -= LINE_WEIGHTS[theirs.bit_count()]
+        return max(-HEURISTIC_CAP, min(HEURISTIC_CAP, score))
+
+
+_GEOMETRIES = {}
+
+
+def get_geometry(rows=3, cols=3, k=3):
+    key = (rows, cols, k)
+    if key not in _GEOMETRIES:
+        _GEOMETRIES[key] = Geometry(rows, cols, k)
+    return _GEOMETRIES[key]
+
 
 # --------- State Logic -----------
 @dataclass
 class State:
-    board: List[List[str]]
+    x: int = 0  # bitmask of cells holding 'X'
+    o: int = 0  # bitmask of cells holding 'O'
+    rows: int = 3
+    cols: int = 3
+    k: int = 3
 
-    def __init__(self):
-        self.board = [['' for _ in range(3)] for _ in range(3)]
+    @property
+    def geometry(self) -> Geometry:
+        return get_geometry(self.rows, self.cols, self.k)
+
+    @property
+    def board(self) -> List[List[str]]:
+        return [['X' if self.x >> (i * self.cols + j) & 1 else 'O' if self.o >> (i * self.cols + j) & 1 else ''
+                 for j in range(self.cols)] for i in range(self.rows)]
+
+    def mask(self, player):
+        return self.x if player == 'X' else self.o
 
     def is_full(self):
-        return all(cell != '' for row in self.board for cell in row)
+        return (self.x | self.o) == self.geometry.full
 
     def winner(self):
-        b = self.board
-        for i in range(3):
-            if b[i][0] == b[i][1] == b[i][2] != '':
-                return b[i][0]
-            if b[0][i] == b[1][i] == b[2][i] != '':
-                return b[0][i]
-        if b[0][0] == b[1][1] == b[2][2] != '':
-            return b[0][0]
-        if b[0][2] == b[1][1] == b[2][0] != '':
-            return b[0][2]
+        geometry = self.geometry
+        if geometry.has_line(self.x):
+            return 'X'
+        if geometry.has_line(self.o):
+            return 'O'
         return None
 
     def available_moves(self):
-        return [(i, j) for i in range(3) for j in range(3) if self.board[i][j] == '']
+        empty = self.geometry.full & ~(self.x | self.o)
+        return [divmod(cell, self.cols) for cell in range(self.rows * self.cols) if empty >> cell & 1]
 
     def make_move(self, i, j, player):
-        self.board[i][j] = player
+        if player == 'X':
+            self.x |= 1 << (i * self.cols + j)
+        else:
+            self.o |= 1 << (i * self.cols + j)
 
     def undo_move(self, i, j):
-        self.board[i][j] = ''
+        bit = ~(1 << (i * self.cols + j))
+        self.x &= bit
+        self.o &= bit
+
+
+# --------- Perfect-Play Table -----------
+# Every position reachable on the standard 3x3 board, solved backwards from
+# the full-board layer.  Index is the base-3 rank sum(cell * 3**i) with
+# cell 0 empty, 1 'X', 2 'O'; X always moves first.  Values use the engine's
+# scoring with WIN_SCORE scaled down to 10 so they fit a signed byte.
+class PerfectPlayTable:
+    TABLE_WIN = 10
+    NO_MOVE = 0xFF
+
+    def __init__(self):
+        self.geometry = get_geometry(3, 3, 3)
+        cells = self.geometry.cells
+        self.base3 = [sum(3 ** c for c in range(cells) if mask >> c & 1) for mask in range(1 << cells)]
+        self.moves = bytearray([self.NO_MOVE]) * 3 ** cells
+        self.values = array('b', bytes(3 ** cells))
+        self.positions = 0
+        self.build()
+
+    def rank(self, x, o):
+        return self.base3[x] + 2 * self.base3[o]
+
+    def build(self):
+        geometry = self.geometry
+        layers = [{(0, 0)}]
+        for stones in range(geometry.cells):
+            layer = set()
+            for x, o in layers[-1]:
+                if geometry.has_line(x) or geometry.has_line(o):
+                    continue
+                empty = geometry.full & ~(x | o)
+                while empty:
+                    bit = empty & -empty
+                    empty ^= bit
+                    layer.add((x | bit, o) if stones % 2 == 0 else (x, o | bit))
+            layers.append(layer)
+        self.positions = sum(len(layer) for layer in layers)
+
+        for stones in range(geometry.cells, -1, -1):
+            x_to_move = stones % 2 == 0
+            for x, o in layers[stones]:
+                index = self.rank(x, o)
+                me, opp = (x, o) if x_to_move else (o, x)
+                if geometry.has_line(opp):
+                    self.values[index] = stones - self.TABLE_WIN
+                    continue
+                best, best_cell = -self.TABLE_WIN - 1, None
+                for cell in range(geometry.cells):
+                    bit = 1 << cell
+                    if (me | opp) & bit:
+                        continue
+                    child = self.rank(x | bit, o) if x_to_move else self.rank(x, o | bit)
+                    if -self.values[child] > best:
+                        best, best_cell = -self.values[child], cell
+                if best_cell is None:
+                    best = 0
+                else:
+                    self.moves[index] = best_cell
+                self.values[index] = best
+
+    def lookup(self, x, o):
+        """(best cell, engine-scale score) for the side to move, or None when not in the table."""
+        index = self.rank(x, o)
+        cell = self.moves[index]
+        if cell == self.NO_MOVE:
+            return None
+        value = self.values[index]
+        if value > 0:
+            value += WIN_SCORE - self.TABLE_WIN
+        elif value < 0:
+            value -= WIN_SCORE - self.TABLE_WIN
+        return cell, value
+
+
+_PERFECT_TABLE = None
+
+
+def get_perfect_table():
+    global _PERFECT_TABLE
+    if _PERFECT_TABLE is None:
+        _PERFECT_TABLE = PerfectPlayTable()
+    return _PERFECT_TABLE
 
 
 # --------- Alpha-Beta Pruning AI -----------
+# Scores are from the side to move and depend only on the position: a win
+# is worth WIN_SCORE minus the stones on the board when it happens, so
+# faster wins score higher and transposition-table values are path-free.
+# Heuristic values at depth cutoffs stay well inside +-HEURISTIC_CAP.
+WIN_SCORE = 1_000_000
+HEURISTIC_CAP = WIN_SCORE // 2
+LINE_WEIGHTS = [0] + [4 ** n for n in range(1, 16)]
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
 class AlphaBetaAI:
-    def __init__(self, player):
+    TABLE_LIMIT = 2_000_000
+
+    def __init__(self, player, time_limit=1.0, max_depth=None, use_table=True, workers=1):
         self.ai_player = player
         self.human_player = 'X' if player == 'O' else 'O'
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.use_table = use_table
+        self.workers = workers
+        self.pool = None
+        self.root_bound = None
+        # canonical position -> (value, bound type, depth, best cell in canonical frame)
+        self.table = {}
+        self.history = {}
+        self.killers = []
+        self.nodes = 0
+        self.depth_reached = 0
+        self.score = 0
+        self.deadline = None
 
     def best_move(self, state: State):
-        best_score = float('-inf')
+        """Iterative deepening over the remaining empty cells until solved or out of time."""
+        geometry = state.geometry
+        me, opp = state.mask(self.ai_player), state.mask(self.human_player)
+        if geometry.has_line(me) or geometry.has_line(opp):
+            return None
+        empties = (geometry.full & ~(me | opp)).bit_count()
+        if not empties:
+            return None
+        self.nodes = 0
+        if self.use_table and (state.rows, state.cols, state.k) == (3, 3, 3) \
+                and (self.ai_player == 'X') == (empties % 2 == 1):
+            entry = get_perfect_table().lookup(state.x, state.o)
+            if entry is not None:
+                cell, self.score = entry
+                self.depth_reached = empties
+                return divmod(cell, geometry.cols)
+        if len(self.table) > self.TABLE_LIMIT:
+            self.table.clear()
+        self.history = {cell: value // 2 for cell, value in self.history.items()}
+        self.killers = [[None, None] for _ in range(empties + 1)]
+        start = time.perf_counter()
+        self.deadline = None if self.time_limit is None else start + self.time_limit
+
+        limit = empties if self.max_depth is None else min(empties, self.max_depth)
         move = None
-        for i, j in state.available_moves():
-            state.make_move(i, j, self.ai_player)
-            score = self.minimax(state, 0, False, float('-inf'), float('inf'))
-            state.undo_move(i, j)
+        for depth in range(1, limit + 1):
+            try:
+                cell, score = self.search_root(geometry, me, opp, depth, move)
+            except SearchTimeout:
+                break
+            move, self.score, self.depth_reached = cell, score, depth
+            if abs(score) >= WIN_SCORE - geometry.cells:
+                break
+            if self.deadline is not None and time.perf_counter() - start > self.time_limit / 2:
+                break
+        if move is None:
+            # not even depth 1 finished: take the best-ordered candidate
+            move = self.order_moves(geometry, me, opp, 0, None)[0]
+        return divmod(move, geometry.cols)
+
+    def search_root(self, geometry, me, opp, depth, pv_move):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_cell, best_score = None, -WIN_SCORE - 1
+        moves = self.order_moves(geometry, me, opp, 0, pv_move)
+        if self.workers > 1 and len(moves) > 2 and depth > 2:
+            return self.search_root_parallel(geometry, me, opp, depth, moves)
+        for cell in moves:
+            score = -self.negamax(geometry, opp, me | (1 << cell), depth - 1, -beta, -alpha, 1, cell)
             if score > best_score:
-                best_score = score
-                move = (i, j)
-        return move
-
-    def minimax(self, state, depth, is_max, alpha, beta):
-        winner = state.winner()
-        if winner == self.ai_player:
-            return 10 - depth
-        elif winner == self.human_player:
-            return depth - 10
-        elif state.is_full():
+                best_cell, best_score = cell, score
+            alpha = max(alpha, score)
+        return best_cell, best_score
+
+    def search_root_parallel(self, geometry, me, opp, depth, moves):
+        """Young brothers wait: search the first move here, then its siblings across the pool.
+
+        Workers read the shared alpha when they start a move and raise it when
+        they beat it.  Only scores above the alpha a move was searched with are
+        exact, so only those can become the best move.
+        """
+        if self.pool is None:
+            self.root_bound = multiprocessing.Value('i', 0)
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_root_worker,
+                                            initargs=(self.root_bound,))
+        beta = WIN_SCORE + 1
+        first = moves[0]
+        best_score = -self.negamax(geometry, opp, me | (1 << first), depth - 1, -beta, WIN_SCORE + 1, 1, first)
+        best_cell, best_index = first, 0
+        self.root_bound.value = best_score
+        remaining = None if self.deadline is None else self.deadline - time.perf_counter()
+        futures = [self.pool.submit(_search_root_move, geometry.rows, geometry.cols, geometry.k,
+                                    me, opp, cell, depth, beta, remaining)
+                   for cell in moves[1:]]
+        timed_out = False
+        for index, future in enumerate(futures, 1):
+            cell, score, exact, nodes = future.result()
+            self.nodes += nodes
+            if score is None:
+                timed_out = True
+            elif exact and (score > best_score or (score == best_score and index < best_index)):
+                best_cell, best_score, best_index = cell, score, index
+        if timed_out:
+            raise SearchTimeout
+        return best_cell, best_score
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def order_moves(self, geometry, me, opp, ply, first):
+        """Hash/PV move first, then this ply's killers, then by history score."""
+        moves = []
+        empty = geometry.candidates(me | opp)
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            moves.append(bit.bit_length() - 1)
+        history = self.history
+        moves.sort(key=lambda c: history.get(c, 0), reverse=True)
+        front = [first] if first is not None else []
+        if ply < len(self.killers):
+            front += [c for c in self.killers[ply] if c is not None and c != first]
+        front = [c for c in front if c in moves]
+        return front + [c for c in moves if c not in front]
+
+    def negamax(self, geometry, me, opp, depth, alpha, beta, ply, last):
+        """Value of the position for the side to move (`me`); `opp` just played `last`."""
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        occupied = me | opp
+        if geometry.wins_at(opp, last):
+            return occupied.bit_count() - WIN_SCORE
+        if occupied == geometry.full:
             return 0
+        if depth == 0:
+            return geometry.evaluate(me, opp)
+
+        key, sym = geometry.canonical(me, opp)
+        entry = self.table.get(key)
+        hash_move = None
+        if entry is not None:
+            value, bound, entry_depth, entry_move = entry
+            if entry_move is not None:
+                hash_move = geometry.sym_inverse[sym][entry_move]
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
 
-        if is_max:
-            max_eval = float('-inf')
-            for i, j in state.available_moves():
-                state.make_move(i, j, self.ai_player)
-                eval = self.minimax(state, depth + 1, False, alpha, beta)
-                state.undo_move(i, j)
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            return max_eval
+        alpha_orig = alpha
+        best, best_cell = -WIN_SCORE - 1, None
+        for cell in self.order_moves(geometry, me, opp, ply, hash_move):
+            score = -self.negamax(geometry, opp, me | (1 << cell), depth - 1, -beta, -alpha, ply + 1, cell)
+            if score > best:
+                best, best_cell = score, cell
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        killers = self.killers[ply]
+                        if killers[0] != cell:
+                            killers[0], killers[1] = cell, killers[0]
+                        self.history[cell] = self.history.get(cell, 0) + depth * depth
+                        break
+
+        if best <= alpha_orig:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
         else:
-            min_eval = float('inf')
-            for i, j in state.available_moves():
-                state.make_move(i, j, self.human_player)
-                eval = self.minimax(state, depth + 1, True, alpha, beta)
-                state.undo_move(i, j)
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            return min_eval
+            bound = EXACT
+        self.table[key] = (best, bound, depth, geometry.sym_cells[sym][best_cell])
+        return best
+
+
+# --------- Parallel Root Workers -----------
+_root_bound = None
+_root_ai = None
+
+
+def _init_root_worker(bound):
+    global _root_bound, _root_ai
+    _root_bound = bound
+    _root_ai = AlphaBetaAI('X', time_limit=None, use_table=False)
+
+
+def _search_root_move(rows, cols, k, me, opp, cell, depth, beta, remaining):
+    geometry = get_geometry(rows, cols, k)
+    ai = _root_ai
+    ai.nodes = 0
+    ai.killers = [[None, None] for _ in range(depth + 1)]
+    ai.deadline = None if remaining is None else time.perf_counter() + remaining
+    alpha = _root_bound.value
+    try:
+        score = -ai.negamax(geometry, opp, me | (1 << cell), depth - 1, -beta, -alpha, 1, cell)
+    except SearchTimeout:
+        return cell, None, False, ai.nodes
+    with _root_bound.get_lock():
+        if score > _root_bound.value:
+            _root_bound.value = score
+    return cell, score, score > alpha, ai.nodes
+
+
+# --------- Self-Play Arena -----------
+ENGINE_OPTIONS = {"time": float, "depth": int, "table": int, "workers": int}
+
+
+def parse_engine(spec):
+    """'time=0.1,depth=4,table=0' -> AlphaBetaAI keyword arguments."""
+    options = {"time_limit": None}
+    for part in filter(None, spec.split(",")):
+        name, _, value = part.partition("=")
+        if name not in ENGINE_OPTIONS:
+            raise ValueError(f"Unknown engine option {name!r} (expected one of {', '.join(ENGINE_OPTIONS)})")
+        value = ENGINE_OPTIONS[name](value)
+        if name == "time":
+            options["time_limit"] = value
+        elif name == "depth":
+            options["max_depth"] = value
+        elif name == "table":
+            options["use_table"] = bool(value)
+        else:
+            options["workers"] = value
+    return options
+
+
+def play_game(engines, a_first, rows, cols, k, seed, random_plies):
+    """Play one game between engine option dicts (a, b); returns winner 'a'/'b'/None and per-engine stats."""
+    rng = random.Random(seed)
+    state = State(rows=rows, cols=cols, k=k)
+    seats = ("a", "b") if a_first else ("b", "a")
+    players = {seats[0]: 'X', seats[1]: 'O'}
+    ais = {name: AlphaBetaAI(players[name], **engines[name]) for name in seats}
+    stats = {name: {"moves": 0, "nodes": 0, "time": 0.0} for name in seats}
+    turn = 0
+    while state.winner() is None and not state.is_full():
+        name = seats[turn % 2]
+        if turn < random_plies:
+            move = rng.choice(state.available_moves())
+        else:
+            start = time.perf_counter()
+            move = ais[name].best_move(state)
+            stats[name]["time"] += time.perf_counter() - start
+            stats[name]["moves"] += 1
+            stats[name]["nodes"] += ais[name].nodes
+        state.make_move(*move, players[name])
+        turn += 1
+    for ai in ais.values():
+        ai.close()
+    winner = state.winner()
+    return {"winner": next((n for n in seats if players[n] == winner), None), "stats": stats}
+
+
+def _play_game_args(args):
+    return play_game(*args)
+
+
+def run_arena(engine_a, engine_b, games, rows=3, cols=3, k=3, workers=None, random_plies=2, seed=0):
+    engines = {"a": parse_engine(engine_a), "b": parse_engine(engine_b)}
+    jobs = [(engines, index % 2 == 0, rows, cols, k, seed + index, random_plies) for index in range(games)]
+    totals = {name: {"win": 0, "draw": 0, "loss": 0, "moves": 0, "nodes": 0, "time": 0.0} for name in engines}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        for result in pool.map(_play_game_args, jobs, chunksize=max(1, games // (4 * (workers or os.cpu_count() or 1)))):
+            for name, total in totals.items():
+                if result["winner"] is None:
+                    total["draw"] += 1
+                elif result["winner"] == name:
+                    total["win"] += 1
+                else:
+                    total["loss"] += 1
+                for key, value in result["stats"][name].items():
+                    total[key] += value
+    elapsed = time.perf_counter() - start
+
+    print(f"{games} games on {rows}x{cols} k={k} in {elapsed:.1f}s")
+    for name, spec in (("a", engine_a), ("b", engine_b)):
+        total = totals[name]
+        nps = total["nodes"] / total["time"] if total["time"] else 0.0
+        latency = 1000 * total["time"] / total["moves"] if total["moves"] else 0.0
+        print(f"{name} [{spec or 'default'}]: W/D/L {total['win']}/{total['draw']}/{total['loss']}"
+              f"  nodes/s {nps:,.0f}  avg move {latency:.2f} ms")
+    return totals
+
+
+def main_cli(argv):
+    parser = argparse.ArgumentParser(description="Headless tools for the tic-tac-toe engine")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    arena = sub.add_parser("arena", help="Play engine configurations against each other")
+    arena.add_argument("engine_a", nargs="?", default="",
+                       help="Comma-separated options: time=SECONDS, depth=N, table=0|1, workers=N")
+    arena.add_argument("engine_b", nargs="?", default="")
+    arena.add_argument("--games", type=int, default=1000)
+    arena.add_argument("--rows", type=int, default=3)
+    arena.add_argument("--cols", type=int, default=3)
+    arena.add_argument("-k", type=int, default=3)
+    arena.add_argument("--workers", type=int, default=None, help="Processes playing games (default: all cores)")
+    arena.add_argument("--random-plies", type=int, default=2, help="Random opening moves per game")
+    arena.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "arena":
+        run_arena(args.engine_a, args.engine_b, args.games, args.rows, args.cols, args.k,
+                  args.workers, args.random_plies, args.seed)
+    return 0
 
 
 # --------- Game Manager and GUI -----------
+# tkinter is imported where the GUI needs it, so headless users (arena, service.py) work without Tk.
 class TicTacToeGUI:
-    def __init__(self, root):
+    def __init__(self, root, rows=3, cols=3, k=3):
+        import tkinter as tk
         self.root = root
+        self.rows, self.cols, self.k = rows, cols, k
         self.root.title("Tic Tac Toe with Alpha-Beta Bot")
 
-        self.state = State()
+        self.state = State(rows=self.rows, cols=self.cols, k=self.k)
         self.bot_first = False  # Default
         self.ai = AlphaBetaAI('O')  # AI is 'O', human is 'X'
-        self.buttons = [[None for _ in range(3)] for _ in range(3)]
+        self.buttons = [[None for _ in range(cols)] for _ in range(rows)]
 
         # Ask user to choose who plays first
         self.ask_first_player()
 
         # Create board
-        for i in range(3):
-            for j in range(3):
+        for i in range(rows):
+            for j in range(cols):
                 btn = tk.Button(root, text='', font=('Arial', 36), width=5, height=2,
                                 command=lambda i=i, j=j: self.user_move(i, j))
                 btn.grid(row=i, column=j)
@@ -114,6 +624,7 @@ class TicTacToeGUI:
             self.bot_move()
 
     def ask_first_player(self):
+        from tkinter import messagebox
         answer = messagebox.askyesno("Who goes first?", "Should the bot play first?")
         self.bot_first = answer
         if self.bot_first:
@@ -138,11 +649,12 @@ class TicTacToeGUI:
             self.check_game_over()
 
     def update_gui(self):
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.rows):
+            for j in range(self.cols):
                 self.buttons[i][j]['text'] = self.state.board[i][j]
 
     def check_game_over(self):
+        from tkinter import messagebox
         winner = self.state.winner()
         if winner:
             messagebox.showinfo("Game Over", f"{winner} wins!")
@@ -155,9 +667,9 @@ class TicTacToeGUI:
         return False
 
     def reset(self):
-        self.state = State()
-        for i in range(3):
-            for j in range(3):
+        self.state = State(rows=self.rows, cols=self.cols, k=self.k)
+        for i in range(self.rows):
+            for j in range(self.cols):
                 self.buttons[i][j]['text'] = ''
         self.ask_first_player()
         if self.bot_first:
@@ -166,6 +678,9 @@ class TicTacToeGUI:
 
 # --------- Run the Game -----------
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(main_cli(sys.argv[1:]))
+    import tkinter as tk
     root = tk.Tk()
     game = TicTacToeGUI(root)
     root.mainloop()
@@ -1,6 +1,33 @@
-import librosa
 import numpy as np
-import soundfile as sf
+import sys
+import hashlib
+import importlib.util
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import argparse
+import glob
+import json
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+def _lazy_import(name):
+    # librosa takes seconds to import; defer it until something is analysed.
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"{name} is required for pitch analysis (pip install {name})")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+librosa = sys.modules.get('librosa') or _lazy_import('librosa')
+sf = sys.modules.get('soundfile') or _lazy_import('soundfile')
 NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
 NOTE_TO_SOLFEGE = {
     'C': 'Do',
@@ -32,20 +59,91 @@ def note_index_to_solfege(index):
 
     return sol
 
-def analyze_notes_solfege(audio_path, quang_interval=0):
-    y, sr = librosa.load(audio_path)
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-
-    solfege_seq = []
-    for t in range(pitches.shape[1]):
-        index = magnitudes[:, t].argmax()
-        freq = pitches[index, t]
-        if freq > 0:
-            _, note_idx = freq_to_note(freq)
-            note_idx += quang_interval
-            sol = note_index_to_solfege(note_idx)
-            solfege_seq.append(sol)
-    return solfege_seq
+def frame_notes(pitches, magnitudes):
+    """Per frame: semitone index (0 = C4) and magnitude of the strongest bin, and whether it is pitched."""
+    frames = np.arange(pitches.shape[1])
+    strongest = magnitudes.argmax(axis=0)
+    freqs = pitches[strongest, frames]
+    voiced = freqs > 0
+    semitones = np.rint(12 * np.log2(np.where(voiced, freqs, 440.0) / 440.0)).astype(np.int64)
+    return semitones + 9, magnitudes[strongest, frames], voiced  # A4 is the 9th note
+
+def note_track(pitches, magnitudes, quang_interval=0):
+    """Semitone index of every voiced frame, shifted by quang_interval."""
+    notes, _, voiced = frame_notes(pitches, magnitudes)
+    return notes[voiced] + quang_interval
+
+# One row per sustained note: semitone index, start and length in seconds,
+# and mean strength of the strongest bin relative to the loudest frame.
+EVENT_DTYPE = np.dtype([('note', np.int16), ('start', np.float32),
+                        ('duration', np.float32), ('confidence', np.float32)])
+
+def _hysteresis(strength, on, off):
+    # Frames above `off` that belong to a run reaching `on` somewhere.
+    above = strength >= off
+    run = np.cumsum(np.diff(above.astype(np.int8), prepend=0) == 1) * above
+    has_peak = np.zeros(run.max() + 1, dtype=bool)
+    has_peak[run[strength >= on]] = True
+    has_peak[0] = False
+    return has_peak[run]
+
+def _median_smooth(values, voiced, width):
+    if width < 2:
+        return values
+    padded = np.pad(np.where(voiced, values, np.nan), width // 2, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, width)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-rest windows
+        smoothed = np.nanmedian(windows, axis=1)[:len(values)]
+    return np.where(np.isnan(smoothed), values, np.rint(smoothed)).astype(np.int64)
+
+def segment_notes(pitches, magnitudes, sr=22050, hop_length=512, quang_interval=0,
+                  smooth=5, on=0.1, off=0.05, min_duration=0.05, split_onsets=True):
+    """Collapse the per-frame track into note events (see EVENT_DTYPE)."""
+    if pitches.shape[1] == 0:
+        return np.empty(0, dtype=EVENT_DTYPE)
+    frames = np.arange(pitches.shape[1])
+    notes, strength, voiced = frame_notes(pitches, magnitudes)
+    strength = strength / strength.max() if strength.max() > 0 else strength
+    voiced &= _hysteresis(strength, on, off)
+    notes = _median_smooth(notes + quang_interval, voiced, smooth | 1)
+
+    change = np.ones(len(frames), dtype=bool)
+    change[1:] = (notes[1:] != notes[:-1]) | (voiced[1:] != voiced[:-1])
+    if split_onsets:
+        # spectral flux of the peak magnitudes marks re-attacks of the same note
+        flux = np.maximum(np.diff(magnitudes, axis=1, prepend=0), 0).sum(axis=0)
+        onsets = librosa.onset.onset_detect(onset_envelope=flux, sr=sr, hop_length=hop_length)
+        change[onsets] = True
+
+    starts = np.flatnonzero(change)
+    lengths = np.diff(np.append(starts, len(frames)))
+    confidence = np.add.reduceat(strength, starts) / lengths
+    seconds = hop_length / sr
+    keep = voiced[starts] & (lengths * seconds >= min_duration)
+
+    events = np.empty(int(keep.sum()), dtype=EVENT_DTYPE)
+    events['note'] = notes[starts[keep]]
+    events['start'] = starts[keep] * seconds
+    events['duration'] = lengths[keep] * seconds
+    events['confidence'] = confidence[keep]
+    return events
+
+def _lookup(indices, to_string):
+    # Format each distinct index once, then fan the strings back out.
+    unique, inverse = np.unique(indices, return_inverse=True)
+    table = np.array([to_string(int(i)) for i in unique], dtype=str)
+    return table[inverse.reshape(-1)] if len(unique) else np.array([], dtype=str)
+
+def note_names(indices):
+    return _lookup(indices, note_index_to_name)
+
+def note_solfege(indices):
+    return _lookup(indices, note_index_to_solfege)
+
+def analyze_notes_solfege(audio_path, quang_interval=0, as_strings=True, backend='piptrack'):
+    analysis = PitchAnalysis(audio_path, backend=backend)
+    return analysis.solfege(quang_interval) if as_strings else analysis.track(quang_interval)
 
 def freq_to_note(freq):
     if freq == 0:
@@ -62,21 +160,634 @@ def note_index_to_name(index):
     octave = 4 + (index // 12)
     return f"{note}{octave}"
 
-def analyze_notes_with_interval(audio_path, quang_interval=3):
-    y, sr = librosa.load(audio_path)
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+def analyze_notes_with_interval(audio_path, quang_interval=3, as_strings=True, backend='piptrack'):
+    analysis = PitchAnalysis(audio_path, backend=backend)
+    # Increase by 'quãng'
+    return analysis.names(quang_interval) if as_strings else analysis.track(quang_interval)
+
+# --------- Stage timing -----------
+_STAGE_TIMES = None  # stage name -> seconds, only while profile_stages() is active
+
+@contextmanager
+def stage(name):
+    if _STAGE_TIMES is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _STAGE_TIMES[name] = _STAGE_TIMES.get(name, 0.0) + time.perf_counter() - start
+
+@contextmanager
+def profile_stages():
+    """Collect decode/pitch/pick/map/segment times of everything run inside the block."""
+    global _STAGE_TIMES
+    previous, _STAGE_TIMES = _STAGE_TIMES, {}
+    try:
+        yield _STAGE_TIMES
+    finally:
+        _STAGE_TIMES = previous
+
+# --------- Pitch backends -----------
+# Each backend maps (y, sr, n_fft, hop_length) to piptrack-shaped
+# (pitches, magnitudes) arrays of bins x frames; frame t is centred on
+# sample t * hop_length.  YIN reports a single bin per frame.
+YIN_FMIN = 65.0      # C2
+YIN_FMAX = 2093.0    # C7
+YIN_BATCH = 512      # frames transformed at once
+
+def piptrack_backend(y, sr, n_fft=2048, hop_length=512):
+    return librosa.piptrack(y=y, sr=sr, n_fft=n_fft, hop_length=hop_length)
+
+def yin_backend(y, sr, n_fft=2048, hop_length=512, fmin=YIN_FMIN, fmax=YIN_FMAX, threshold=0.1):
+    """YIN with the difference function computed from FFT cross-correlation.
+
+    Frames are strided views into the padded signal.  Where no lag dips
+    below `threshold` the global minimum is used; magnitude is frame RMS
+    scaled by periodicity (1 - normalized difference), so noise scores low.
+    """
+    y = np.pad(np.asarray(y, dtype=np.float64), n_fft // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(y, n_fft)[::hop_length]
+    max_lag = min(int(np.ceil(sr / fmin)) + 2, n_fft // 2)
+    min_lag = max(int(sr / fmax), 2)
+    width = n_fft - max_lag
+    lags = np.arange(max_lag)
+
+    pitches = np.zeros((1, len(frames)))
+    magnitudes = np.zeros((1, len(frames)))
+    for start in range(0, len(frames), YIN_BATCH):
+        batch = frames[start:start + YIN_BATCH]
+        # x[j] x[j + lag] summed over the first `width` samples; no wrap-around since
+        # width + max_lag == n_fft.
+        acf = np.fft.irfft(np.fft.rfft(batch, n_fft) * np.conj(np.fft.rfft(batch[:, :width], n_fft)), n_fft)
+        energy = np.concatenate([np.zeros((len(batch), 1)), np.cumsum(batch ** 2, axis=1)], axis=1)
+        diff = (energy[:, width:width + 1] - energy[:, :1]) \
+            + (energy[:, width:width + max_lag] - energy[:, :max_lag]) - 2 * acf[:, :max_lag]
+        diff = np.maximum(diff, 0)
+
+        cmnd = np.ones_like(diff)
+        running = np.cumsum(diff[:, 1:], axis=1)
+        np.divide(diff[:, 1:] * lags[1:], running, out=cmnd[:, 1:], where=running > 0)
+
+        trough = np.zeros_like(cmnd, dtype=bool)
+        trough[:, 1:-1] = (cmnd[:, 1:-1] < cmnd[:, :-2]) & (cmnd[:, 1:-1] <= cmnd[:, 2:])
+        trough[:, :min_lag] = False
+        candidates = trough & (cmnd < threshold)
+        fallback = np.argmin(np.where(trough, cmnd, np.inf), axis=1)
+        lag = np.where(candidates.any(axis=1), candidates.argmax(axis=1), fallback)
+
+        rows = np.arange(len(batch))
+        left, mid, right = cmnd[rows, lag - 1], cmnd[rows, lag], cmnd[rows, np.minimum(lag + 1, max_lag - 1)]
+        curve = left - 2 * mid + right
+        shift = np.divide(left - right, 2 * curve, out=np.zeros_like(curve), where=np.abs(curve) > 1e-12)
+        period = lag + np.clip(shift, -1, 1)
+
+        rms = np.sqrt(energy[:, -1] / n_fft)
+        voiced = trough[rows, lag] & (rms > 1e-6)
+        pitches[0, start:start + len(batch)] = np.divide(sr, period, out=np.zeros_like(period), where=voiced)
+        magnitudes[0, start:start + len(batch)] = np.where(voiced, rms * np.clip(1 - mid, 0, 1), 0)
+    return pitches, magnitudes
+
+PITCH_BACKENDS = {'piptrack': piptrack_backend, 'yin': yin_backend}
+
+def synthetic_melody(notes, sr=22050, note_seconds=0.5, harmonics=3, hop_length=512):
+    """Harmonic tones for the given semitone indices; returns (y, expected note per frame, -1 at edges)."""
+    samples = int(note_seconds * sr)
+    t = np.arange(samples) / sr
+    y = np.concatenate([sum(np.sin(2 * np.pi * 440.0 * 2 ** ((n - 9) / 12) * (h + 1) * t) / (h + 1)
+                            for h in range(harmonics)) for n in notes])
+    centres = np.arange(len(y) // hop_length + 1) * hop_length
+    truth = np.asarray(notes)[np.minimum(centres // samples, len(notes) - 1)]
+    edge = np.abs(centres - np.rint(centres / samples) * samples) < hop_length * 2
+    return y.astype(np.float32), np.where(edge, -1, truth)
+
+def compare_backends(audio_path="demo.mp3", backends=None, sr=22050):
+    """Throughput (seconds of audio per second) and note accuracy of each backend."""
+    backends = backends or list(PITCH_BACKENDS)
+    melody = list(range(-21, 27, 2))  # C2 .. C#6 in whole tones
+    y_synth, truth = synthetic_melody(melody, sr)
+    y_file, _ = librosa.load(audio_path, sr=sr)
+    reference = None
+    for name in backends:
+        backend = PITCH_BACKENDS[name]
+        start = time.perf_counter()
+        pitches, magnitudes = backend(y_synth, sr)
+        synth_speed = len(y_synth) / sr / (time.perf_counter() - start)
+        notes, _, voiced = frame_notes(pitches, magnitudes)
+        scored = truth >= 0
+        accuracy = np.mean(voiced[scored] & (notes[scored] == truth[scored]))
+
+        start = time.perf_counter()
+        pitches, magnitudes = backend(y_file, sr)
+        file_speed = len(y_file) / sr / (time.perf_counter() - start)
+        notes, _, voiced = frame_notes(pitches, magnitudes)
+        if reference is None:
+            reference = notes, voiced
+        both = voiced & reference[1]
+        agreement = np.mean(notes[both] == reference[0][both]) if both.any() else 0.0
+        print(f"{name:10s} synthetic {synth_speed:8.0f}x realtime, accuracy {accuracy:6.1%} | "
+              f"{os.path.basename(audio_path)} {file_speed:8.0f}x realtime, voiced {voiced.mean():6.1%}, "
+              f"agrees with {backends[0]} {agreement:6.1%}")
+
+# Decoded and pitch-tracked files, most recently used last.  Each entry holds
+# two (bins x frames) float32 arrays, so only a few files are kept.
+TRACK_CACHE_SIZE = 4
+_TRACK_CACHE = OrderedDict()
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class PitchAnalysis:
+    """Decode and pitch-track a file once; derive names, solfège and transpositions from it."""
+
+    def __init__(self, audio_path, sr=22050, n_fft=2048, hop_length=None, cache_dir=None, backend='piptrack'):
+        if backend not in PITCH_BACKENDS:
+            raise ValueError(f"Unknown pitch backend {backend!r} (expected one of {', '.join(PITCH_BACKENDS)})")
+        self.audio_path = audio_path
+        self.backend = backend
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length or n_fft // 4
+        self.cache_dir = cache_dir
+        self._pitches = None
+        self._magnitudes = None
+        self._track = None
+
+    def memory_key(self):
+        stat = os.stat(self.audio_path)
+        return (os.path.abspath(self.audio_path), stat.st_mtime_ns, stat.st_size,
+                self.sr, self.n_fft, self.hop_length, self.backend)
+
+    def disk_paths(self):
+        name = f"{file_digest(self.audio_path)}_{self.backend}_{self.sr}_{self.n_fft}_{self.hop_length}"
+        return (os.path.join(self.cache_dir, name + "_pitches.npy"),
+                os.path.join(self.cache_dir, name + "_magnitudes.npy"))
+
+    def compute(self):
+        with stage("decode"):
+            y, sr = librosa.load(self.audio_path, sr=self.sr)
+        with stage("pitch"):
+            return PITCH_BACKENDS[self.backend](y, sr, self.n_fft, self.hop_length)
+
+    def load(self):
+        key = self.memory_key()
+        if key in _TRACK_CACHE:
+            _TRACK_CACHE.move_to_end(key)
+            return _TRACK_CACHE[key]
+
+        result = None
+        if self.cache_dir:
+            paths = self.disk_paths()
+            if all(os.path.exists(p) for p in paths):
+                result = tuple(np.load(p, mmap_mode='r') for p in paths)
+            else:
+                result = self.compute()
+                os.makedirs(self.cache_dir, exist_ok=True)
+                for path, array in zip(paths, result):
+                    tmp = f"{path}.{os.getpid()}.tmp"
+                    with open(tmp, 'wb') as f:
+                        np.save(f, array)
+                    os.replace(tmp, path)
+        if result is None:
+            result = self.compute()
+
+        _TRACK_CACHE[key] = result
+        while len(_TRACK_CACHE) > TRACK_CACHE_SIZE:
+            _TRACK_CACHE.popitem(last=False)
+        return result
+
+    @property
+    def pitches(self):
+        if self._pitches is None:
+            self._pitches, self._magnitudes = self.load()
+        return self._pitches
+
+    @property
+    def magnitudes(self):
+        if self._magnitudes is None:
+            self._pitches, self._magnitudes = self.load()
+        return self._magnitudes
+
+    def track(self, quang_interval=0):
+        if self._track is None:
+            pitches, magnitudes = self.pitches, self.magnitudes
+            with stage("pick"):
+                self._track = note_track(pitches, magnitudes)
+        return self._track + quang_interval
+
+    def names(self, quang_interval=0):
+        track = self.track(quang_interval)
+        with stage("map"):
+            return note_names(track)
+
+    def solfege(self, quang_interval=0):
+        track = self.track(quang_interval)
+        with stage("map"):
+            return note_solfege(track)
+
+    def events(self, quang_interval=0, **options):
+        pitches, magnitudes = self.pitches, self.magnitudes
+        with stage("segment"):
+            return segment_notes(pitches, magnitudes, self.sr, self.hop_length, quang_interval, **options)
+
+    def transpositions(self, intervals, solfege=False):
+        to_strings = note_solfege if solfege else note_names
+        return {interval: to_strings(self.track(interval)) for interval in intervals}
+
+# Streaming: frames never straddle blocks because consecutive blocks overlap
+# by n_fft - hop samples, so block-wise tracking (center=False) yields the
+# same frames as tracking the whole signal at once.
+STREAM_SR = 22050
+STREAM_N_FFT = 2048
+
+def _stream_params(sr, n_fft):
+    # Keep the analysis window the same length in seconds as at 22050 Hz.
+    if n_fft is None:
+        n_fft = int(round(STREAM_N_FFT * sr / STREAM_SR))
+    return n_fft, n_fft // 4
+
+def _track_blocks(blocks, sr, n_fft, hop, quang_interval, as_strings):
+    for block in blocks:
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        if len(block) < n_fft:
+            continue
+        pitches, magnitudes = librosa.piptrack(y=np.ascontiguousarray(block, dtype=np.float32), sr=sr,
+                                               n_fft=n_fft, hop_length=hop, center=False)
+        track = note_track(pitches, magnitudes, quang_interval)
+        yield from (note_names(track) if as_strings else track)
+
+def stream_notes(audio_path, quang_interval=0, block_frames=256, n_fft=None, as_strings=True):
+    """Yield notes block by block; memory is bounded by block_frames STFT frames."""
+    sr = sf.info(audio_path).samplerate
+    n_fft, hop = _stream_params(sr, n_fft)
+    blocks = sf.blocks(audio_path, blocksize=n_fft + hop * (block_frames - 1), overlap=n_fft - hop,
+                       dtype='float32', always_2d=True)
+    yield from _track_blocks(blocks, sr, n_fft, hop, quang_interval, as_strings)
+
+def _pcm_blocks(stream, block_len, overlap, dtype, channels):
+    width = np.dtype(dtype).itemsize * channels
+    scale = float(np.iinfo(dtype).max + 1) if np.dtype(dtype).kind == 'i' else 1.0
+    tail = np.zeros((0, channels), dtype=np.float32)
+    pending = b''
+    while True:
+        data = stream.read((block_len - len(tail)) * width - len(pending))
+        if not data:
+            break
+        pending += data
+        usable = len(pending) - len(pending) % width
+        samples = np.frombuffer(pending[:usable], dtype=dtype).reshape(-1, channels) / scale
+        pending = pending[usable:]
+        tail = np.concatenate([tail, samples.astype(np.float32)])
+        if len(tail) >= block_len:
+            yield tail
+            tail = tail[len(tail) - overlap:]
+    if len(tail) > overlap:
+        yield tail
+
+def stream_notes_pcm(stream=None, sr=STREAM_SR, dtype='int16', channels=1, quang_interval=0,
+                     block_frames=16, n_fft=None, as_strings=True):
+    """Like stream_notes, but reads raw interleaved PCM (default: stdin)."""
+    if stream is None:
+        stream = sys.stdin.buffer
+    n_fft, hop = _stream_params(sr, n_fft)
+    blocks = _pcm_blocks(stream, n_fft + hop * (block_frames - 1), n_fft - hop, dtype, channels)
+    yield from _track_blocks(blocks, sr, n_fft, hop, quang_interval, as_strings)
+
+# --------- Benchmark -----------
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TIME_NOISE_FLOOR = 0.005  # seconds; smaller slowdowns are never flagged
+ACCURACY_DROP = 0.001     # fraction of scored frames
+PORTABLE_FIELDS = ("frames", "accuracy", "voiced")  # same on every machine
+MELODY = list(range(-12, 25, 3))  # C3 .. C6 in minor thirds
+
+# name -> (kind, seconds, SNR in dB or None)
+BENCHMARK_SIGNALS = {
+    "tone": ("tone", 2.0, None),
+    "chord": ("chord", 2.0, None),
+    "glissando": ("glissando", 4.0, None),
+    "melody": ("melody", 6.5, None),
+    "melody_snr20": ("melody", 6.5, 20.0),
+    "melody_snr5": ("melody", 6.5, 5.0),
+    "melody_long": ("melody", 120.0, None),
+}
+
+def _harmonic(freq, t, harmonics=3):
+    return sum(np.sin(2 * np.pi * freq * (h + 1) * t) / (h + 1) for h in range(harmonics))
+
+def synthetic_signal(kind, seconds, sr=22050, snr_db=None, hop_length=512, seed=0):
+    """Test audio and its ground truth: acceptable notes per frame (rows padded with -1, all -1 = unscored)."""
+    samples = int(seconds * sr)
+    t = np.arange(samples) / sr
+    frames = samples // hop_length + 1
+    truth = np.full((frames, 3), -1, dtype=np.int64)
+    if kind == "tone":
+        y = _harmonic(440.0, t)
+        truth[2:-2, 0] = 9
+    elif kind == "chord":
+        chord = [0, 4, 7]  # C4 E4 G4
+        y = sum(_harmonic(440.0 * 2 ** ((n - 9) / 12), t) for n in chord) / len(chord)
+        truth[2:-2] = chord
+    elif kind == "glissando":
+        # C3 up to C6 at a constant rate in semitones; both semitones around the true pitch count
+        rate = 36 / seconds / 12  # octaves per second
+        phase = 2 * np.pi * 440.0 * 2 ** ((-12 - 9) / 12) * (2 ** (rate * t) - 1) / (rate * np.log(2))
+        y = sum(np.sin(phase * (h + 1)) / (h + 1) for h in range(3))
+        position = -12 + 36 * np.arange(frames) * hop_length / samples
+        truth[2:-2, 0] = np.floor(position)[2:-2]
+        truth[2:-2, 1] = np.ceil(position)[2:-2]
+    elif kind == "melody":
+        notes = (MELODY * int(np.ceil(seconds / (0.5 * len(MELODY)))))[:max(1, int(seconds / 0.5))]
+        y, melody_truth = synthetic_melody(notes, sr, 0.5, hop_length=hop_length)
+        y = np.pad(y, (0, max(0, samples - len(y))))[:samples]
+        truth[:, 0] = np.pad(melody_truth, (0, frames))[:frames]
+    else:
+        raise ValueError(f"Unknown signal kind {kind!r}")
+    y = 0.5 * y / np.abs(y).max()
+    if snr_db is not None:
+        noise = np.random.default_rng(seed).standard_normal(samples)
+        y = y + noise * np.sqrt(np.mean(y ** 2) / 10 ** (snr_db / 10))
+    return y.astype(np.float32), truth
+
+def benchmark_signal(path, truth, backend, sr=22050, repeat=1, trace_memory=False):
+    """Analyse one file end to end; the fastest of `repeat` runs is kept."""
+    best = None
+    for _ in range(repeat):
+        _TRACK_CACHE.clear()
+        if trace_memory:
+            tracemalloc.start()
+        with profile_stages() as stages:
+            start = time.perf_counter()
+            analysis = PitchAnalysis(path, sr=sr, backend=backend)
+            analysis.names()
+            analysis.events()
+            elapsed = time.perf_counter() - start
+        peak = 0
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if best is None or elapsed < best["time"]:
+            best = {"time": elapsed, "stages": dict(stages), "memory_peak": peak}
+
+    notes, _, voiced = frame_notes(analysis.pitches, analysis.magnitudes)
+    scored = (truth >= 0).any(axis=1)
+    correct = voiced & (truth == notes[:, None]).any(axis=1)
+    seconds = (truth.shape[0] - 1) * analysis.hop_length / sr
+    best.update({"frames": int(truth.shape[0]), "accuracy": float(correct[scored].mean()) if scored.any() else 0.0,
+                 "voiced": float(voiced.mean()), "realtime": seconds / best["time"],
+                 "instrumented": trace_memory})
+    return best
+
+def run_benchmark(signals=None, backends=None, repeat=1, trace_memory=False, sr=22050):
+    results = {}
+    _warm_worker()  # keep librosa import and numba compilation out of the first timing
+    with tempfile.TemporaryDirectory() as folder:
+        for name in signals or BENCHMARK_SIGNALS:
+            kind, seconds, snr = BENCHMARK_SIGNALS[name]
+            y, truth = synthetic_signal(kind, seconds, sr, snr)
+            path = os.path.join(folder, name + ".wav")
+            sf.write(path, y, sr)
+            librosa.load(path, sr=sr)  # warm the decoder and page cache
+            for backend in backends or PITCH_BACKENDS:
+                result = benchmark_signal(path, truth, backend, sr, repeat, trace_memory)
+                results[f"{name}:{backend}"] = result
+                stages = " ".join(f"{k}={v * 1e3:.1f}" for k, v in result["stages"].items())
+                memory = f" peak {result['memory_peak'] / 2 ** 20:.1f}MB" if trace_memory else ""
+                print(f"{name:13s} {backend:9s} acc {result['accuracy']:6.1%} voiced {result['voiced']:6.1%} "
+                      f"{result['realtime']:7.0f}x realtime  ms: {stages}{memory}")
+    return results
+
+def compare_baseline(results, baseline, tolerance=0.5):
+    """Accuracy must not drop; times may grow by `tolerance` unless either run traced memory.
+
+    Times are only compared when the baseline has them (see --portable).
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None or base["frames"] != result["frames"]:
+            continue
+        if result["accuracy"] < base["accuracy"] - ACCURACY_DROP:
+            regressions.append(f"{key}: accuracy {result['accuracy']:.2%} < {base['accuracy']:.2%}")
+        if result["instrumented"] or base.get("instrumented") or "time" not in base:
+            continue
+        limit = max(base["time"] * (1 + tolerance), base["time"] + TIME_NOISE_FLOOR)
+        if result["time"] > limit:
+            regressions.append(f"{key}: time {result['time'] * 1e3:.1f}ms > {limit * 1e3:.1f}ms")
+    return regressions
+
+# --------- Batch processing -----------
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aiff', '.aif')
+
+def expand_inputs(inputs):
+    """Files, directories (searched recursively) and glob patterns -> sorted unique audio paths."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for folder, _, files in os.walk(item):
+                paths.update(os.path.join(folder, f) for f in files if f.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(item):
+            paths.add(item)
+        else:
+            paths.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+def manifest_key(path):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+def read_manifest(path):
+    done = set()
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    done.add(json.loads(line)["key"])
+    return done
+
+def _warm_worker():
+    # Pay for the librosa import and numba compilation once per worker.
+    y = np.zeros(4096, dtype=np.float32)
+    librosa.piptrack(y=y, sr=22050)
+    librosa.onset.onset_detect(onset_envelope=np.zeros(8), sr=22050)
+
+def analyze_file(path, quang_interval=0, backend='piptrack', cache_dir=None):
+    analysis = PitchAnalysis(path, backend=backend, cache_dir=cache_dir)
+    start = time.perf_counter()
+    track = analysis.track(quang_interval)
+    events = analysis.events(quang_interval)
+    return {"path": path, "backend": backend, "interval": quang_interval,
+            "frames": int(analysis.pitches.shape[1]), "seconds": time.perf_counter() - start,
+            "track": track, "events": events}
+
+class JsonlWriter:
+    """One JSON object per file; note names for the frame track, event rows as lists."""
+
+    def __init__(self, path, solfege=False):
+        self.file = open(path, 'a') if path != '-' else sys.stdout
+        self.to_strings = note_solfege if solfege else note_names
+
+    def write(self, result):
+        events = result["events"]
+        record = {k: v for k, v in result.items() if k not in ("track", "events")}
+        record["notes"] = self.to_strings(result["track"]).tolist()
+        record["events"] = [[name, round(float(start), 4), round(float(duration), 4), round(float(conf), 4)]
+                            for name, start, duration, conf in zip(self.to_strings(events['note']), events['start'],
+                                                                   events['duration'], events['confidence'])]
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+class ColumnWriter:
+    """One .npz per file holding each event field and the frame track as separate columns."""
+
+    def __init__(self, path, solfege=False):
+        self.folder = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, result):
+        stem = os.path.splitext(os.path.basename(result["path"]))[0]
+        name = f"{stem}_{hashlib.sha1(os.path.abspath(result['path']).encode()).hexdigest()[:8]}.npz"
+        tmp = os.path.join(self.folder, name + ".tmp")
+        with open(tmp, 'wb') as f:
+            np.savez(f, track=result["track"], **{field: result["events"][field] for field in EVENT_DTYPE.names})
+        os.replace(tmp, os.path.join(self.folder, name))
+
+    def close(self):
+        pass
+
+def run_batch(paths, writer, manifest=None, workers=None, quang_interval=0, backend='piptrack', cache_dir=None):
+    done = read_manifest(manifest)
+    todo = [p for p in paths if manifest_key(p) not in done]
+    print(f"{len(todo)} to analyse, {len(paths) - len(todo)} already done", file=sys.stderr)
+    log = open(manifest, 'a') if manifest else None
+    failed = 0
+    try:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_warm_worker) as pool:
+            limit = 2 * workers
+            pending = {}
+            queue = iter(todo)
+            while True:
+                for path in queue:
+                    pending[pool.submit(analyze_file, path, quang_interval, backend, cache_dir)] = path
+                    if len(pending) >= limit:
+                        break
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        failed += 1
+                        print(f"{path}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                        continue
+                    writer.write(result)
+                    if log:
+                        log.write(json.dumps({"key": manifest_key(path), "path": path}) + "\n")
+                        log.flush()
+    finally:
+        if log:
+            log.close()
+        writer.close()
+    return failed
+
+def main_cli(argv):
+    parser = argparse.ArgumentParser(description="Pitch and note detection")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    notes = sub.add_parser("notes", help="Print the note track of one file")
+    notes.add_argument("audio", nargs="?", default="demo.mp3")
+    notes.add_argument("--interval", type=int, default=4, help="Transpose by this many semitones")
+    notes.add_argument("--solfege", action="store_true")
+    notes.add_argument("--backend", choices=list(PITCH_BACKENDS), default="piptrack")
+
+    stream = sub.add_parser("stream", help="Print notes as they are detected (file or raw PCM on stdin)")
+    stream.add_argument("audio", help="Audio file, or - for raw PCM on stdin")
+    stream.add_argument("--interval", type=int, default=0)
+    stream.add_argument("--sr", type=int, default=STREAM_SR, help="Sample rate of raw PCM")
+    stream.add_argument("--dtype", default="int16", help="Sample type of raw PCM")
+    stream.add_argument("--channels", type=int, default=1, help="Channels of raw PCM")
+
+    batch = sub.add_parser("batch", help="Analyse many files across processes")
+    batch.add_argument("inputs", nargs="+", help="Files, directories or glob patterns")
+    batch.add_argument("-o", "--output", required=True, help="JSONL file ('-' for stdout) or folder for --format columns")
+    batch.add_argument("--format", choices=["jsonl", "columns"], default="jsonl")
+    batch.add_argument("--manifest", help="Completed-file log used to resume (default: OUTPUT.manifest)")
+    batch.add_argument("--workers", type=int, default=None)
+    batch.add_argument("--interval", type=int, default=0)
+    batch.add_argument("--solfege", action="store_true")
+    batch.add_argument("--backend", choices=list(PITCH_BACKENDS), default="piptrack")
+    batch.add_argument("--cache-dir", help="Keep pitch tracks as .npy here")
+
+    bench = sub.add_parser("benchmark", help="Stage timings, memory and accuracy on synthetic audio")
+    bench.add_argument("--signals", nargs="+", choices=list(BENCHMARK_SIGNALS))
+    bench.add_argument("--backends", nargs="+", choices=list(PITCH_BACKENDS))
+    bench.add_argument("--repeat", type=int, default=3, help="Keep the fastest of N runs")
+    bench.add_argument("--memory", action="store_true", help="Track peak memory (times are then not compared)")
+    bench.add_argument("--baseline", default=BASELINE_FILE)
+    bench.add_argument("--save-baseline", action="store_true")
+    bench.add_argument("--portable", action="store_true",
+                       help="Save only the machine-independent accuracy figures, without times (as committed)")
+    bench.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown")
 
-    transformed_notes = []
-    for t in range(pitches.shape[1]):
-        index = magnitudes[:, t].argmax()
-        freq = pitches[index, t]
-        if freq > 0:
-            note, note_idx = freq_to_note(freq)
-            new_idx = note_idx + quang_interval  # Increase by 'quãng'
-            new_note = note_index_to_name(new_idx)
-            transformed_notes.append(new_note)
-    return transformed_notes
+    compare = sub.add_parser("compare-backends", help="Throughput and accuracy of each pitch backend")
+    compare.add_argument("audio", nargs="?", default="demo.mp3")
 
-notes = analyze_notes_with_interval("demo.mp3", quang_interval=4)  # +4 semitones (a major third)
-print(notes)
+    args = parser.parse_args(argv)
+    if args.command == "notes":
+        analysis = PitchAnalysis(args.audio, backend=args.backend)
+        result = analysis.solfege(args.interval) if args.solfege else analysis.names(args.interval)
+        print(result.tolist())
+    elif args.command == "stream":
+        if args.audio == "-":
+            source = stream_notes_pcm(sr=args.sr, dtype=args.dtype, channels=args.channels,
+                                      quang_interval=args.interval)
+        else:
+            source = stream_notes(args.audio, args.interval)
+        for note in source:
+            print(note, flush=True)
+    elif args.command == "batch":
+        paths = expand_inputs(args.inputs)
+        if args.format == "columns":
+            writer = ColumnWriter(args.output, args.solfege)
+        else:
+            writer = JsonlWriter(args.output, args.solfege)
+        manifest = args.manifest or (None if args.output == "-" else args.output.rstrip("/\\") + ".manifest")
+        return 1 if run_batch(paths, writer, manifest, args.workers, args.interval, args.backend, args.cache_dir) else 0
+    elif args.command == "benchmark":
+        results = run_benchmark(args.signals, args.backends, args.repeat, args.memory)
+        if args.save_baseline:
+            if args.portable:
+                results = {key: {field: result[field] for field in PORTABLE_FIELDS} for key, result in results.items()}
+            with open(args.baseline, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Saved baseline to {args.baseline}")
+        elif os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                regressions = compare_baseline(results, json.load(f), args.tolerance)
+            for line in regressions:
+                print("REGRESSION", line)
+            if not regressions:
+                print(f"No regressions against {args.baseline}")
+            return 1 if regressions else 0
+        else:
+            print(f"No baseline at {args.baseline}, nothing compared")
+    elif args.command == "compare-backends":
+        compare_backends(args.audio)
+    return 0
 
+if __name__ == "__main__":
+    # No arguments: the original demo, demo.mp3 raised by a major third.
+    sys.exit(main_cli(sys.argv[1:] or ["notes"]))
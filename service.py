@@ -0,0 +1,322 @@
+"""Long-running local service for the 8-puzzle, tic-tac-toe and pitch projects.
+
+Requests are JSON objects {"id": ..., "op": ..., ...params}; each reply echoes
+the id with {"ok": true, "result": ...} or {"ok": false, "error": ...} plus
+"latency_ms".  Transport is JSON lines on stdin/stdout by default, or HTTP on
+localhost with --http PORT (POST /<op> with the params as the body,
+GET /metrics).
+
+    echo '{"id": 1, "op": "puzzle.solve", "board": "123456078"}' | python service.py
+"""
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROJECTS = {
+    "puzzle": "1. 8-puzzle problem",
+    "tictactoe": "3. Tic tac toe problem",
+    "pitch": "4. Pitch detection",
+}
+
+
+# --------- Project loading -----------
+def load_project(name):
+    """Import <project>/main.py as module `name`; registered so worker processes can unpickle it."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, PROJECTS[name], "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def project(name):
+    try:
+        return load_project(name)
+    except ImportError as exc:
+        raise RuntimeError(f"{name} is unavailable: {exc}") from exc
+
+
+# --------- Worker state -----------
+# Each worker process keeps its own warm state between requests.
+_puzzle_cache = None
+_searchers = {}
+_players = {}
+
+
+def _init_worker(puzzle_cache_path=None, warm=False):
+    """Each project is set up on its own; one that cannot load only fails its own ops."""
+    global _puzzle_cache
+    try:
+        puzzle = project("puzzle")
+        puzzle._init_worker(None)  # SIGALRM handler for per-request timeouts
+        _puzzle_cache = puzzle.SolutionCache(path=puzzle_cache_path)
+        if warm:
+            puzzle.get_heuristic("manhattan", puzzle.DEFAULT_GOAL)
+    except RuntimeError:
+        pass
+    if warm:
+        try:
+            project("tictactoe").get_perfect_table()
+        except RuntimeError:
+            pass
+        try:
+            project("pitch")._warm_worker()
+        except RuntimeError:
+            pass
+
+
+def puzzle_solve(board, goal=None, strategy="astar", heuristic="manhattan", timeout=None, weight=None, budget=None):
+    puzzle = project("puzzle")
+    board = puzzle.parse_board(board) if isinstance(board, str) else board
+    if goal is None:
+        goal = puzzle.default_goal(len(board))
+    elif isinstance(goal, str):
+        goal = puzzle.parse_board(goal)
+    key = (strategy, heuristic, weight, budget)
+    if key not in _searchers:
+        _searchers[key] = puzzle.make_searcher(strategy, heuristic, weight=weight, time_limit=budget)
+    record = puzzle.solve_instance(_searchers[key], None, board, goal, timeout, _puzzle_cache)
+    del record["index"]
+    return record
+
+
+def tictactoe_move(board, player, k=None, time_limit=1.0):
+    """`board` is a list of rows, each a string or list using 'X', 'O' and anything else for empty."""
+    tictactoe = project("tictactoe")
+    if player not in ('X', 'O'):
+        raise ValueError(f"player must be 'X' or 'O', not {player!r}")
+    rows, cols = len(board), len(board[0])
+    state = tictactoe.State(rows=rows, cols=cols, k=k or min(rows, cols))
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell in ('X', 'O'):
+                state.make_move(i, j, cell)
+    key = (player, time_limit, rows, cols, state.k)  # transposition tables are per board shape
+    if key not in _players:
+        _players[key] = tictactoe.AlphaBetaAI(player, time_limit=time_limit)
+    ai = _players[key]
+    move = ai.best_move(state)
+    return {"move": list(move) if move else None, "score": ai.score, "nodes": ai.nodes,
+            "depth": ai.depth_reached, "winner": state.winner(), "full": state.is_full()}
+
+
+def pitch_notes(path, interval=0, solfege=False, backend="piptrack"):
+    analysis = project("pitch").PitchAnalysis(path, backend=backend)
+    notes = analysis.solfege(interval) if solfege else analysis.names(interval)
+    return {"frames": int(analysis.pitches.shape[1]), "notes": notes.tolist()}
+
+
+def pitch_events(path, interval=0, backend="piptrack"):
+    pitch = project("pitch")
+    events = pitch.PitchAnalysis(path, backend=backend).events(interval)
+    names = pitch.note_names(events['note'])
+    return {"events": [[name, round(float(start), 4), round(float(duration), 4), round(float(conf), 4)]
+                       for name, start, duration, conf in zip(names, events['start'], events['duration'],
+                                                              events['confidence'])]}
+
+
+OPERATIONS = {
+    "puzzle.solve": puzzle_solve,
+    "tictactoe.move": tictactoe_move,
+    "pitch.notes": pitch_notes,
+    "pitch.events": pitch_events,
+}
+
+
+def run_operation(op, params):
+    start = time.perf_counter()
+    result = OPERATIONS[op](**params)
+    return result, time.perf_counter() - start
+
+
+# --------- Service -----------
+class Metrics:
+    """Request counts, errors and recent latencies per operation."""
+    WINDOW = 1000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ops = {}
+
+    def record(self, op, latency, run_time, ok):
+        with self.lock:
+            entry = self.ops.setdefault(op, {"count": 0, "errors": 0, "latency": deque(maxlen=self.WINDOW),
+                                             "run": deque(maxlen=self.WINDOW)})
+            entry["count"] += 1
+            entry["errors"] += not ok
+            entry["latency"].append(latency)
+            if run_time is not None:
+                entry["run"].append(run_time)
+
+    @staticmethod
+    def percentile(values, q):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+    def snapshot(self):
+        with self.lock:
+            report = {}
+            for op, entry in self.ops.items():
+                report[op] = {"count": entry["count"], "errors": entry["errors"]}
+                for field in ("latency", "run"):
+                    for q in (50, 90, 99):
+                        report[op][f"{field}_p{q}_ms"] = round(1e3 * self.percentile(entry[field], q), 3)
+            return report
+
+
+class Service:
+    def __init__(self, workers=None, puzzle_cache_path=None, warm=False):
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(puzzle_cache_path, warm))
+        self.metrics = Metrics()
+
+    def submit(self, request, reply):
+        """Run one request on the pool and call reply(response) when it finishes."""
+        start = time.perf_counter()
+        request_id = request.pop("id", None) if isinstance(request, dict) else None
+        op = request.pop("op", None) if isinstance(request, dict) else None
+
+        def finish(ok, value, run_time=None):
+            latency = time.perf_counter() - start
+            known = op in OPERATIONS or op in ("ping", "metrics")
+            self.metrics.record(op if known else "invalid", latency, run_time, ok)
+            response = {"id": request_id, "ok": ok, "result" if ok else "error": value,
+                        "latency_ms": round(latency * 1e3, 3)}
+            reply(response)
+
+        if op == "ping":
+            return finish(True, "pong")
+        if op == "metrics":
+            return finish(True, self.metrics.snapshot())
+        if op not in OPERATIONS:
+            return finish(False, f"Unknown op {op!r} (expected one of {', '.join(['ping', 'metrics', *OPERATIONS])})")
+
+        def done(future):
+            try:
+                result, run_time = future.result()
+            except Exception as exc:
+                finish(False, f"{type(exc).__name__}: {exc}")
+            else:
+                finish(True, result, run_time)
+
+        self.pool.submit(run_operation, op, request).add_done_callback(done)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def serve_stdio(service, stdin=sys.stdin, stdout=sys.stdout):
+    """Requests are read line by line; replies are written as each finishes, so they may be out of order."""
+    lock = threading.Lock()
+    pending = threading.Semaphore(0)
+    count = 0
+
+    def reply(response):
+        with lock:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+        pending.release()
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        count += 1
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as exc:
+            reply({"id": None, "ok": False, "error": f"Invalid JSON: {exc}"})
+            continue
+        service.submit(request, reply)
+    for _ in range(count):
+        pending.acquire()
+
+
+def serve_http(service, port, host="127.0.0.1"):
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def handle_request(self, request):
+            finished = threading.Event()
+            box = []
+
+            def reply(response):
+                box.append(response)
+                finished.set()
+
+            service.submit(request, reply)
+            finished.wait()
+            self.send_json(200 if box[0]["ok"] else 400, box[0])
+
+        def do_GET(self):
+            self.handle_request({"op": self.path.strip("/")})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            try:
+                request = json.loads(body) if body else {}
+            except json.JSONDecodeError as exc:
+                return self.send_json(400, {"ok": False, "error": f"Invalid JSON: {exc}"})
+            if not isinstance(request, dict):
+                return self.send_json(400, {"ok": False, "error": "Request body must be a JSON object"})
+            request["op"] = self.path.strip("/")
+            self.handle_request(request)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Listening on http://{host}:{server.server_port}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Headless service for the puzzle, tic-tac-toe and pitch solvers")
+    parser.add_argument("--http", type=int, metavar="PORT", help="Serve HTTP on localhost instead of stdin/stdout")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--puzzle-cache", help="sqlite file shared by the workers' 8-puzzle solution caches")
+    parser.add_argument("--warm", action="store_true", help="Load heuristic tables and librosa in every worker up front")
+    args = parser.parse_args(argv)
+
+    for name in PROJECTS:
+        try:
+            load_project(name)
+        except ImportError as exc:
+            print(f"{name} disabled: {exc}", file=sys.stderr)
+    service = Service(args.workers, args.puzzle_cache, args.warm)
+    try:
+        if args.http is not None:
+            serve_http(service, args.http)
+        else:
+            serve_stdio(service)
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))